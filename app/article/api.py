@@ -1,63 +1,153 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+from config.deps import get_current_active_user
 from database.session import get_db
-from pydantic import BaseModel
-from datetime import datetime
+from app.common.export import ExportFormat, export_response
+from app.common.pagination import CursorPage, InvalidCursor
 from app.common.schemas.base_response import BaseResponse
+from app.user.loaders import UserLoader, create_user_loader, get_user_loader
+from cache import cache_response, get_cache, response_cache_key
+from . import models, services, schemas
 
 router = APIRouter()
 
+ArticleResponse = BaseResponse[schemas.Article]
+ArticleListResponse = BaseResponse[
+    Union[CursorPage[schemas.ArticleWithAuthor], List[schemas.ArticleWithAuthor]]
+]
+ArticleBulkResponse = BaseResponse[schemas.ArticleBulkResult]
+ArticleSearchResponse = BaseResponse[CursorPage[schemas.ArticleSearchHit]]
 
-class ArticleBase(BaseModel):
-    title: str
-    content: str
-    author_id: int
 
+@router.post("/", response_model=ArticleResponse)
+async def create_article(
+    article: schemas.ArticleCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_active_user)
+):
+    """创建新文章"""
+    if article.author_id != current_user.id and not current_user.is_superuser:
+        return ArticleResponse(code=403, msg="Not enough privileges")
+    try:
+        db_article = await services.create_article(db, article)
+    except IntegrityError:
+        await db.rollback()
+        return ArticleResponse(code=400, msg="Unknown author_id")
+    return ArticleResponse(data=db_article)
 
-class ArticleCreate(ArticleBase):
-    pass
 
+@router.post("/bulk", response_model=ArticleBulkResponse)
+async def bulk_create_articles(
+    payload: schemas.ArticleBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_active_user)
+):
+    """批量创建文章"""
+    if not current_user.is_superuser and any(a.author_id != current_user.id for a in payload.articles):
+        return ArticleBulkResponse(code=403, msg="Not enough privileges")
+    try:
+        ids = await services.bulk_create_articles(db, payload.articles)
+    except IntegrityError:
+        return ArticleBulkResponse(code=400, msg="Unknown author_id")
+    return ArticleBulkResponse(data=schemas.ArticleBulkResult(count=len(ids), ids=ids))
 
-class Article(ArticleBase):
-    id: int
-    created_at: datetime
-    updated_at: datetime
 
-    class Config:
-        from_attributes = True
+@router.get("/", response_model=ArticleListResponse)
+async def list_articles(
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    users: UserLoader = Depends(get_user_loader)
+):
+    """获取文章列表 (含作者摘要)
 
+    Pass `cursor` (empty for the first page) to use keyset pagination.
+    """
+    if cursor is not None:
+        try:
+            articles, next_cursor = await services.get_articles_page(db, cursor=cursor, limit=limit)
+        except InvalidCursor:
+            return ArticleListResponse(code=400, msg="Invalid cursor")
+        items = await services.attach_authors(articles, users)
+        return ArticleListResponse(
+            data=CursorPage[schemas.ArticleWithAuthor](items=items, next_cursor=next_cursor)
+        )
+    articles = await services.get_articles(db, skip=skip, limit=limit)
+    return ArticleListResponse(data=await services.attach_authors(articles, users))
 
-@router.post("/", response_model=BaseResponse)
-def create_article(article: ArticleCreate, db: Session = Depends(get_db)):
-    """创建新文章"""
-    # 这里应该添加实际的数据库操作
-    return BaseResponse(data={
-        "id": 1,
-        "title": article.title,
-        "content": article.content,
-        "author_id": article.author_id,
-        "created_at": datetime.now(),
-        "updated_at": datetime.now()
-    })
-
-
-@router.get("/", response_model=BaseResponse)
-def list_articles(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    """获取文章列表"""
-    # 这里应该添加实际的数据库操作
-    return BaseResponse(data=[])
-
-
-@router.get("/{article_id}", response_model=BaseResponse)
-def get_article(article_id: int, db: Session = Depends(get_db)):
+
+@router.get("/export")
+async def export_articles(
+    request: Request,
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    current_user = Depends(get_current_active_user)
+):
+    """导出文章列表 (NDJSON / CSV 流式输出, 含作者摘要)"""
+    stmt = select(models.Article).order_by(models.Article.id)
+    return export_response(
+        request,
+        stmt,
+        schemas.ArticleWithAuthor,
+        fmt,
+        filename="articles",
+        enrich=lambda session, rows: services.attach_authors(rows, create_user_loader(session)),
+    )
+
+
+@router.get("/search", response_model=ArticleSearchResponse)
+async def search_articles(
+    q: str = Query(min_length=1, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_db),
+    users: UserLoader = Depends(get_user_loader)
+):
+    """全文搜索文章 (按相关度排序, 游标分页)"""
+    try:
+        hits, next_cursor = await services.search_articles(db, q, cursor=cursor, limit=limit)
+    except InvalidCursor:
+        return ArticleSearchResponse(code=400, msg="Invalid cursor")
+    items = await services.attach_authors([article for article, _ in hits], users)
+    return ArticleSearchResponse(data=CursorPage[schemas.ArticleSearchHit](
+        items=[
+            schemas.ArticleSearchHit(**item.model_dump(), rank=rank)
+            for item, (_, rank) in zip(items, hits)
+        ],
+        next_cursor=next_cursor,
+    ))
+
+
+@router.put("/{article_id}", response_model=ArticleResponse)
+async def update_article(
+    article_id: int,
+    changes: schemas.ArticleUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_active_user)
+):
+    """更新文章"""
+    db_article = await services.get_article(db, article_id=article_id)
+    if db_article is None:
+        return ArticleResponse(code=404, msg="Article not found")
+    if db_article.author_id != current_user.id and not current_user.is_superuser:
+        return ArticleResponse(code=403, msg="Not enough privileges")
+    try:
+        db_article = await services.update_article(db, db_article, changes)
+    except IntegrityError:
+        await db.rollback()
+        return ArticleResponse(code=400, msg="Invalid article")
+    await get_cache().delete(response_cache_key(f"/v1/articles/{article_id}"))
+    return ArticleResponse(data=db_article)
+
+
+@router.get("/{article_id}", response_model=ArticleResponse)
+@cache_response(ttl=300)
+async def get_article(article_id: int, db: AsyncSession = Depends(get_db)):
     """获取单篇文章"""
-    # 这里应该添加实际的数据库操作
-    return BaseResponse(data={
-        "id": article_id,
-        "title": "示例文章",
-        "content": "这是文章内容",
-        "author_id": 1,
-        "created_at": datetime.now(),
-        "updated_at": datetime.now()
-    }) 
\ No newline at end of file
+    db_article = await services.get_article_public(db, article_id=article_id)
+    if db_article is None:
+        return ArticleResponse(code=404, msg="Article not found")
+    return ArticleResponse(data=db_article)
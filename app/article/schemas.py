@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator
+from app.user.schemas import UserSummary
+
+# Upper bound of articles accepted by one bulk request
+MAX_BULK_ARTICLES = 10000
+
+
+class ArticleBase(BaseModel):
+    title: str = Field(max_length=255)
+    content: str
+    author_id: int
+
+
+class ArticleCreate(ArticleBase):
+    pass
+
+
+class ArticleUpdate(BaseModel):
+    title: Optional[str] = Field(default=None, max_length=255)
+    content: Optional[str] = None
+
+    @field_validator("title", "content")
+    @classmethod
+    def not_null(cls, value: Optional[str]) -> str:
+        # Omit a field to leave it unchanged; both columns are NOT NULL
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
+
+class ArticleBulkCreate(BaseModel):
+    articles: List[ArticleCreate] = Field(min_length=1, max_length=MAX_BULK_ARTICLES)
+
+
+class ArticleBulkResult(BaseModel):
+    count: int
+    ids: List[int]
+
+
+class Article(ArticleBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ArticleWithAuthor(Article):
+    author: Optional[UserSummary] = None
+
+
+class ArticleSearchHit(ArticleWithAuthor):
+    rank: float
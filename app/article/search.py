@@ -0,0 +1,227 @@
+"""Ranked full-text search over article title and content
+
+Two engines share one interface:
+
+* PostgresSearch matches against the generated, GIN-indexed
+  articles.search_vector column (migration b7d3e9a1c4f2) and ranks
+  with ts_rank_cd. Postgres keeps the vector current on every write.
+* MemorySearch is an in-process inverted index ranked with BM25, for
+  SQLite and tests. It is built from the table at startup and updated
+  by the article services on create and update; other processes only see
+  their own writes until restarted.
+
+Both page with a keyset cursor on (rank desc, id asc) instead of OFFSET.
+"""
+import logging
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import Float, and_, cast, func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.common.pagination import InvalidCursor, MAX_PAGE_SIZE, _cursor_value, decode_cursor, encode_cursor
+from config.config import settings
+from database.session import get_engine, get_sessionmaker
+from . import models
+
+logger = logging.getLogger(__name__)
+
+# Text search configuration baked into the generated column
+SEARCH_CONFIG = "english"
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# Title matches count as much as this many content matches
+TITLE_WEIGHT = 3
+
+REBUILD_CHUNK_SIZE = 1000
+
+# (article, rank) pairs of one page and the cursor of the next
+SearchPage = Tuple[List[Tuple[models.Article, float]], Optional[str]]
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _decode_search_cursor(cursor: Optional[str]) -> Optional[Tuple[float, int]]:
+    if not cursor:
+        return None
+    values = decode_cursor(cursor)
+    rank = values.get("rank")
+    if isinstance(rank, bool) or not isinstance(rank, (int, float)) or not math.isfinite(rank):
+        raise InvalidCursor("Invalid cursor")
+    return float(rank), _cursor_value(values, models.Article.id)
+
+
+def _page(hits: Sequence[Tuple[models.Article, float]], limit: int) -> SearchPage:
+    """Trim hits fetched with one extra row and build the next cursor"""
+    if len(hits) <= limit:
+        return list(hits), None
+    hits = list(hits[:limit])
+    last, rank = hits[-1]
+    return hits, encode_cursor({"rank": rank, "id": last.id})
+
+
+class SearchEngine:
+    async def start(self) -> None:
+        pass
+
+    async def search(self, db: AsyncSession, query: str, cursor: Optional[str], limit: int) -> SearchPage:
+        raise NotImplementedError
+
+    def index(self, documents: Iterable[Tuple[int, str, str]]) -> None:
+        """(id, title, content) of created or updated articles; no-op where the database indexes"""
+
+    def stats(self) -> Dict[str, Any]:
+        return {"engine": type(self).__name__}
+
+
+class PostgresSearch(SearchEngine):
+    """tsvector @@ websearch_to_tsquery, served by the GIN index"""
+
+    async def search(self, db: AsyncSession, query: str, cursor: Optional[str], limit: int) -> SearchPage:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        after = _decode_search_cursor(cursor)
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        vector = literal_column("articles.search_vector")
+        # float8 so the rank survives the cursor round trip exactly
+        rank = cast(func.ts_rank_cd(vector, tsquery), Float)
+        stmt = select(models.Article, rank).where(vector.op("@@")(tsquery))
+        if after is not None:
+            stmt = stmt.where(or_(rank < after[0], and_(rank == after[0], models.Article.id > after[1])))
+        result = await db.execute(stmt.order_by(rank.desc(), models.Article.id).limit(limit + 1))
+        return _page([tuple(row) for row in result.all()], limit)
+
+
+class MemorySearch(SearchEngine):
+    """Inverted index with BM25 ranking; all query terms must match"""
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        # term -> {article id: weighted term frequency}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._terms: Dict[int, Tuple[str, ...]] = {}
+        self._lengths: Dict[int, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, article_id: int, title: str, content: str) -> None:
+        self.remove(article_id)
+        counts = Counter(tokenize(content))
+        for term in tokenize(title):
+            counts[term] += TITLE_WEIGHT
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[article_id] = tf
+        length = sum(counts.values())
+        self._terms[article_id] = tuple(counts)
+        self._lengths[article_id] = length
+        self._total_length += length
+
+    def remove(self, article_id: int) -> None:
+        terms = self._terms.pop(article_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            posting = self._postings[term]
+            del posting[article_id]
+            if not posting:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(article_id)
+
+    def index(self, documents: Iterable[Tuple[int, str, str]]) -> None:
+        for article_id, title, content in documents:
+            self.add(article_id, title, content)
+
+    def rank(self, query: str) -> List[Tuple[int, float]]:
+        """All matching ids with their BM25 score, best first"""
+        terms = set(tokenize(query))
+        postings = [self._postings.get(term) for term in terms]
+        if not postings or any(p is None for p in postings):
+            return []
+        postings.sort(key=len)
+        # Intersect starting from the rarest term
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        n = len(self._lengths)
+        avg_length = self._total_length / n
+        scores = dict.fromkeys(candidates, 0.0)
+        k1, b = self.k1, self.b
+        for posting in postings:
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for article_id in candidates:
+                tf = posting[article_id]
+                norm = k1 * (1 - b + b * self._lengths[article_id] / avg_length)
+                scores[article_id] += idf * tf * (k1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda hit: (-hit[1], hit[0]))
+
+    async def search(self, db: AsyncSession, query: str, cursor: Optional[str], limit: int) -> SearchPage:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        after = _decode_search_cursor(cursor)
+        hits = self.rank(query)
+        if after is not None:
+            hits = [(i, r) for i, r in hits if r < after[0] or (r == after[0] and i > after[1])]
+        hits = hits[:limit + 1]
+        if not hits:
+            return [], None
+        result = await db.execute(
+            select(models.Article).filter(models.Article.id.in_([i for i, _ in hits]))
+        )
+        articles = {article.id: article for article in result.scalars()}
+        # Rows deleted since they were indexed are skipped
+        page = [(articles[i], r) for i, r in hits if i in articles]
+        return _page(page, limit)
+
+    async def start(self) -> None:
+        """Build the index from the articles table"""
+        after = 0
+        async with get_sessionmaker()() as db:
+            while True:
+                result = await db.execute(
+                    select(models.Article.id, models.Article.title, models.Article.content)
+                    .filter(models.Article.id > after)
+                    .order_by(models.Article.id)
+                    .limit(REBUILD_CHUNK_SIZE)
+                )
+                rows = result.all()
+                self.index(rows)
+                if len(rows) < REBUILD_CHUNK_SIZE:
+                    break
+                after = rows[-1][0]
+        logger.info(f"Indexed {len(self)} article(s) for search")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"engine": type(self).__name__, "articles": len(self), "terms": len(self._postings)}
+
+
+def create_search_engine(name: str) -> SearchEngine:
+    """Build a search engine from its SEARCH_DRIVER name"""
+    if name == "auto":
+        name = "postgres" if get_engine().dialect.name == "postgresql" else "memory"
+    if name == "postgres":
+        return PostgresSearch()
+    if name == "memory":
+        return MemorySearch()
+    raise ValueError(f"Unsupported search driver: {name}")
+
+
+_engine: Optional[SearchEngine] = None
+
+
+def get_search_engine() -> SearchEngine:
+    global _engine
+    if _engine is None:
+        _engine = create_search_engine(settings.SEARCH_DRIVER)
+    return _engine
+
+
+def close_search_engine() -> None:
+    global _engine
+    _engine = None
@@ -0,0 +1,109 @@
+from typing import List, Optional, Sequence
+from sqlalchemy import bindparam, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.common.pagination import keyset_paginate
+from cache import singleflight
+from database.warmup import register_hot_statement
+from app.user.loaders import UserLoader
+from app.user.schemas import UserSummary
+from . import models, schemas
+from .search import SearchPage, get_search_engine
+
+# Rows per INSERT statement; 3 bind params per row keeps each statement
+# far below the 32767 parameter limit of the Postgres wire protocol
+BULK_INSERT_CHUNK_SIZE = 1000
+
+register_hot_statement(select(models.Article).filter(models.Article.id == bindparam("article_id", 0)))
+
+
+async def get_article(db: AsyncSession, article_id: int):
+    result = await db.execute(select(models.Article).filter(models.Article.id == article_id))
+    return result.scalar_one_or_none()
+
+
+@singleflight()
+async def get_article_public(db: AsyncSession, article_id: int) -> Optional[schemas.Article]:
+    """Read-only article lookup; concurrent calls for the same id share one query"""
+    article = await get_article(db, article_id)
+    return schemas.Article.model_validate(article) if article is not None else None
+
+
+async def get_articles(db: AsyncSession, skip: int = 0, limit: int = 10):
+    result = await db.execute(
+        select(models.Article).order_by(models.Article.id).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
+
+
+async def get_articles_page(db: AsyncSession, cursor: Optional[str] = None, limit: int = 10):
+    """Keyset page of articles ordered by primary key"""
+    return await keyset_paginate(db, select(models.Article), models.Article.id, cursor, limit)
+
+
+async def attach_authors(
+    articles: Sequence[models.Article],
+    users: UserLoader,
+) -> List[schemas.ArticleWithAuthor]:
+    """Embed author summaries, resolving all authors with one batched query"""
+    authors = await users.load_many([article.author_id for article in articles])
+    items = []
+    for article, author in zip(articles, authors):
+        item = schemas.ArticleWithAuthor.model_validate(article)
+        item.author = UserSummary.model_validate(author) if author is not None else None
+        items.append(item)
+    return items
+
+
+async def create_article(db: AsyncSession, article: schemas.ArticleCreate):
+    db_article = models.Article(**article.model_dump())
+    db.add(db_article)
+    await db.commit()
+    await db.refresh(db_article)
+    get_search_engine().index([(db_article.id, db_article.title, db_article.content)])
+    return db_article
+
+
+async def update_article(db: AsyncSession, db_article: models.Article, changes: schemas.ArticleUpdate):
+    """Apply the fields set in changes and reindex the article for search"""
+    for field, value in changes.model_dump(exclude_unset=True).items():
+        setattr(db_article, field, value)
+    await db.commit()
+    await db.refresh(db_article)
+    get_search_engine().index([(db_article.id, db_article.title, db_article.content)])
+    return db_article
+
+
+async def search_articles(
+    db: AsyncSession,
+    query: str,
+    cursor: Optional[str] = None,
+    limit: int = 10,
+) -> SearchPage:
+    """Ranked keyset page of articles matching every term of query"""
+    return await get_search_engine().search(db, query, cursor, limit)
+
+
+async def bulk_create_articles(
+    db: AsyncSession,
+    articles: List[schemas.ArticleCreate],
+    chunk_size: int = BULK_INSERT_CHUNK_SIZE,
+) -> List[int]:
+    """Insert articles with one multi-row INSERT ... RETURNING per chunk
+
+    All chunks share one transaction, so the batch is committed once and
+    either lands completely or not at all.
+    """
+    ids: List[int] = []
+    try:
+        for start in range(0, len(articles), chunk_size):
+            rows = [a.model_dump() for a in articles[start:start + chunk_size]]
+            result = await db.execute(
+                insert(models.Article).values(rows).returning(models.Article.id)
+            )
+            ids.extend(result.scalars().all())
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    get_search_engine().index((i, a.title, a.content) for i, a in zip(ids, articles))
+    return ids
@@ -1,22 +1,35 @@
-from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from config.config import settings
-from config.security import create_access_token, verify_password
-from database.session import get_db
+from config.hashing import HashingPoolSaturated
+from config.deps import get_current_user, oauth2_scheme
+from config.security import create_user_token, decode_access_token
+from database.session import client_key_for, get_db
 from app.user import services as user_services
 from app.user.schemas import UserCreate
+from mail import queue_mail, welcome_mail
 from . import schemas
+from .revocation import get_revocation_service
 import logging
 from app.common.schemas.base_response import BaseResponse
+from ratelimit import RateLimit, body_email, client_ip, form_username
 
 router = APIRouter()
 
+TokenResponse = BaseResponse[schemas.Token]
+
 logger = logging.getLogger(__name__)
 
 
-@router.post("/register", response_model=BaseResponse)
+@router.post(
+    "/register",
+    response_model=TokenResponse,
+    dependencies=[
+        Depends(RateLimit("register:ip", settings.RATE_LIMIT_REGISTER, client_ip)),
+        Depends(RateLimit("register:email", settings.RATE_LIMIT_REGISTER, body_email)),
+    ],
+)
 async def register(
     request: schemas.RegisterRequest,
     db: AsyncSession = Depends(get_db)
@@ -25,13 +38,18 @@ async def register(
     try:
         # 验证密码
         if request.password != request.confirm_password:
-            return BaseResponse(code=400, msg="Passwords do not match")
+            return TokenResponse(code=400, msg="Passwords do not match")
         
         # 检查邮箱是否已注册
         db_user = await user_services.get_user_by_email(db, email=request.email)
         if db_user:
-            return BaseResponse(code=400, msg="Email already registered")
+            return TokenResponse(code=400, msg="Email already registered")
         
+        # Committed together with the user; delivered in the background
+        queue_mail(db, welcome_mail(request.email))
+        # The caller reads as the new user from now on; keep those reads on the primary
+        db.info["client_key"] = client_key_for(request.email)
+
         # 创建用户
         user = await user_services.create_user(
             db=db,
@@ -42,21 +60,24 @@ async def register(
         )
         
         # 生成访问令牌
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={"sub": user.email},
-            expires_delta=access_token_expires
-        )
-        return BaseResponse(data={
-            "access_token": access_token,
-            "token_type": "bearer"
-        })
+        access_token = create_user_token(user)
+        return TokenResponse(data=schemas.Token(access_token=access_token))
+    except HashingPoolSaturated:
+        # Surface as 503 via the application exception handler
+        raise
     except Exception as e:
         logger.error(f"注册失败: {str(e)}", exc_info=True)
-        return BaseResponse(code=500, msg="Internal Server Error", data=str(e))
+        return TokenResponse(code=500, msg="Internal Server Error")
 
 
-@router.post("/login", response_model=BaseResponse)
+@router.post(
+    "/login",
+    response_model=TokenResponse,
+    dependencies=[
+        Depends(RateLimit("login:ip", settings.RATE_LIMIT_LOGIN_IP, client_ip)),
+        Depends(RateLimit("login:account", settings.RATE_LIMIT_LOGIN, form_username)),
+    ],
+)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db)
@@ -69,16 +90,24 @@ async def login(
             password=form_data.password
         )
         if not user:
-            return BaseResponse(code=401, msg="Incorrect email or password")
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={"sub": user.email},
-            expires_delta=access_token_expires
-        )
-        return BaseResponse(data={
-            "access_token": access_token,
-            "token_type": "bearer"
-        })
+            return TokenResponse(code=401, msg="Incorrect email or password")
+        access_token = create_user_token(user)
+        return TokenResponse(data=schemas.Token(access_token=access_token))
+    except HashingPoolSaturated:
+        # Surface as 503 via the application exception handler
+        raise
     except Exception as e:
         logger.error(f"登录失败: {str(e)}", exc_info=True)
-        return BaseResponse(code=500, msg="Internal Server Error", data=str(e)) 
\ No newline at end of file
+        return TokenResponse(code=500, msg="Internal Server Error")
+
+
+@router.post("/logout", response_model=BaseResponse, dependencies=[Depends(get_current_user)])
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    """退出登录 (吊销当前令牌)"""
+    if not await get_revocation_service().revoke_token(db, decode_access_token(token)):
+        return BaseResponse(code=400, msg="Token cannot be revoked")
+    await db.commit()
+    return BaseResponse(msg="Logged out")
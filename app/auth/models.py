@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Float, Integer, String
+from database.base import Base
+
+
+class TokenRevocation(Base):
+    """Revoked token id (kind "jti") or user (kind "user", all tokens issued before revoked_at)
+
+    Times are epoch seconds so they compare directly with JWT iat/exp.
+    Workers read new rows incrementally by id.
+    """
+    __tablename__ = "token_revocations"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(8), nullable=False)
+    subject = Column(String(64), nullable=False)
+    revoked_at = Column(Float, nullable=False)
+    expires_at = Column(Float, nullable=False, index=True)
@@ -0,0 +1,416 @@
+"""Token revocation checked in memory on every authenticated request
+
+Each worker keeps every live revocation locally:
+
+* per-user "revoked before" timestamps in a dict, so deactivating a user
+  rejects all tokens issued before that moment;
+* revoked token ids (jti) as 64-bit hashes in a bloom filter backed by a
+  sorted array, so a miss (the common case) costs three bit tests and a
+  hit is confirmed exactly. Hashes use Python's str hash, which is cached
+  on the claim string, and are only ever compared within one process.
+
+Revocations are written to the token_revocations table (or a Redis
+sorted set with REVOCATION_DRIVER=redis) and every worker pulls new
+entries incrementally. Entries are dropped, locally and from the store,
+once the tokens they cover expire.
+"""
+import asyncio
+import bisect
+import logging
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import delete, event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from cache.redis import RedisClient
+from config.config import settings
+from database.session import get_sessionmaker
+from .models import TokenRevocation
+
+logger = logging.getLogger(__name__)
+
+_MASK32 = 0xFFFFFFFF
+
+# Session.info key of revocations applied locally once the session commits
+_PENDING = "revocations_pending"
+
+# Ids re-read on every refresh: rows committed out of id order by
+# concurrent transactions are still picked up (applying is idempotent)
+_REFRESH_OVERLAP = 256
+_FETCH_BATCH = 5000
+
+# Pending jti hashes are merged into the sorted array once they exceed
+# this many, or an eighth of the array, keeping merges amortized O(1)
+_MERGE_THRESHOLD = 4096
+
+
+class BloomFilter:
+    """Bit array with three probes per key, about 0.5% false positives at 16 bits per key"""
+
+    __slots__ = ("size", "bits")
+
+    def __init__(self, capacity: int, bits_per_key: int = 16):
+        self.size = max(64, capacity * bits_per_key)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, h: int) -> None:
+        h1 = h & _MASK32
+        h2 = ((h >> 32) & _MASK32) | 1
+        size, bits = self.size, self.bits
+        for i in range(3):
+            p = (h1 + i * h2) % size
+            bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, h: int) -> bool:
+        h1 = h & _MASK32
+        h2 = ((h >> 32) & _MASK32) | 1
+        size, bits = self.size, self.bits
+        p = h1 % size
+        if not bits[p >> 3] & (1 << (p & 7)):
+            return False
+        p = (h1 + h2) % size
+        if not bits[p >> 3] & (1 << (p & 7)):
+            return False
+        p = (h1 + 2 * h2) % size
+        return bool(bits[p >> 3] & (1 << (p & 7)))
+
+
+@dataclass(frozen=True, slots=True)
+class Revocation:
+    kind: str  # "jti" or "user"
+    subject: str
+    revoked_at: float
+    expires_at: float
+
+    def encode(self) -> str:
+        return f"{self.kind}|{self.subject}|{self.revoked_at}|{self.expires_at}"
+
+    @classmethod
+    def decode(cls, raw: bytes) -> "Revocation":
+        kind, subject, revoked_at, expires_at = raw.decode().split("|")
+        return cls(kind, subject, float(revoked_at), float(expires_at))
+
+
+class RevocationList:
+    """Per-worker view of every live revocation"""
+
+    def __init__(self, capacity: int = 1024):
+        self._bloom = BloomFilter(capacity)
+        self._capacity = capacity
+        # jti hashes sorted ascending, with the matching token expiry
+        self._hashes = array("q")
+        self._expiries = array("d")
+        self._pending: Dict[int, float] = {}
+        # user id -> (revoked_before, entry expiry)
+        self._users: Dict[int, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._hashes) + len(self._pending) + len(self._users)
+
+    def add(self, entry: Revocation) -> None:
+        if entry.kind == "user":
+            user_id = int(entry.subject)
+            current = self._users.get(user_id)
+            if current is None or current[0] < entry.revoked_at:
+                self._users[user_id] = (entry.revoked_at, entry.expires_at)
+            return
+        h = hash(entry.subject)
+        if h in self._pending or self._stored(h):
+            return
+        self._pending[h] = entry.expires_at
+        if len(self._hashes) + len(self._pending) > self._capacity:
+            self.compact()
+            return
+        self._bloom.add(h)
+        if len(self._pending) > max(_MERGE_THRESHOLD, len(self._hashes) >> 3):
+            self._merge()
+
+    def extend(self, entries: List[Revocation]) -> None:
+        """Add many entries with a single rebuild instead of incremental merges"""
+        if len(entries) <= _MERGE_THRESHOLD:
+            for entry in entries:
+                self.add(entry)
+            return
+        for entry in entries:
+            if entry.kind == "user":
+                self.add(entry)
+            else:
+                self._pending[hash(entry.subject)] = entry.expires_at
+        self.compact()
+
+    def _stored(self, h: int) -> bool:
+        i = bisect.bisect_left(self._hashes, h)
+        return i < len(self._hashes) and self._hashes[i] == h
+
+    def is_revoked(self, claims: Dict[str, Any]) -> bool:
+        """Whether verified claims belong to a revoked token; no I/O"""
+        if self._users:
+            user = self._users.get(claims.get("uid"))
+            if user is not None and claims.get("iat", 0) < user[0]:
+                return True
+        jti = claims.get("jti")
+        if jti is None:
+            return False
+        h = hash(jti)
+        if h not in self._bloom:
+            return False
+        return h in self._pending or self._stored(h)
+
+    def _merge(self) -> None:
+        """Move pending hashes into the sorted array; the bloom filter already has them"""
+        merged = list(zip(self._hashes, self._expiries))
+        merged.extend(self._pending.items())
+        merged.sort()
+        self._hashes = array("q", (h for h, _ in merged))
+        self._expiries = array("d", (exp for _, exp in merged))
+        self._pending = {}
+
+    def compact(self, now: Optional[float] = None) -> None:
+        """Merge pending hashes, drop expired entries and resize the bloom filter"""
+        now = time.time() if now is None else now
+        live = {h: exp for h, exp in zip(self._hashes, self._expiries) if exp > now}
+        live.update((h, exp) for h, exp in self._pending.items() if exp > now)
+        live = sorted(live.items())
+        self._hashes = array("q", (h for h, _ in live))
+        self._expiries = array("d", (exp for _, exp in live))
+        self._pending = {}
+        self._capacity = max(1024, 2 * len(live))
+        self._bloom = BloomFilter(self._capacity)
+        for h in self._hashes:
+            self._bloom.add(h)
+        self._users = {uid: v for uid, v in self._users.items() if v[1] > now}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tokens": len(self._hashes) + len(self._pending),
+            "users": len(self._users),
+            "bloom_bytes": len(self._bloom.bits),
+            "array_bytes": self._hashes.itemsize * len(self._hashes)
+            + self._expiries.itemsize * len(self._expiries),
+        }
+
+
+class DatabaseSource:
+    """Revocations stored in token_revocations, read by increasing id"""
+
+    # Published rows exist only if the caller's transaction commits
+    transactional = True
+
+    async def publish(self, db: AsyncSession, entry: Revocation) -> None:
+        # Joins the caller's transaction; visible to workers once committed
+        db.add(TokenRevocation(
+            kind=entry.kind,
+            subject=entry.subject,
+            revoked_at=entry.revoked_at,
+            expires_at=entry.expires_at,
+        ))
+
+    async def fetch(self, cursor: int) -> Tuple[List[Revocation], int]:
+        entries: List[Revocation] = []
+        after = max(0, cursor - _REFRESH_OVERLAP)
+        async with get_sessionmaker()() as db:
+            while True:
+                result = await db.execute(
+                    select(TokenRevocation)
+                    .filter(TokenRevocation.id > after, TokenRevocation.expires_at > time.time())
+                    .order_by(TokenRevocation.id)
+                    .limit(_FETCH_BATCH)
+                )
+                rows = result.scalars().all()
+                entries.extend(
+                    Revocation(row.kind, row.subject, row.revoked_at, row.expires_at) for row in rows
+                )
+                if rows:
+                    after = rows[-1].id
+                    cursor = max(cursor, after)
+                if len(rows) < _FETCH_BATCH:
+                    return entries, cursor
+
+    async def purge(self) -> None:
+        async with get_sessionmaker()() as db:
+            await db.execute(delete(TokenRevocation).filter(TokenRevocation.expires_at <= time.time()))
+            await db.commit()
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisSource:
+    """Revocations in a Redis sorted set scored by a sequence number
+
+    Members are "seq|<encoded revocation>". A second sorted set indexes
+    the same members by expiry, so purge drops expired entries from both
+    with range commands while workers keep reading by sequence number.
+    """
+
+    def __init__(self, client: RedisClient, key: str):
+        self.client = client
+        self.key = key
+        self.seq_key = f"{key}:seq"
+        self.expiry_key = f"{key}:expiry"
+
+    # Published entries are visible to every worker at once
+    transactional = False
+
+    async def publish(self, db: AsyncSession, entry: Revocation) -> None:
+        seq = await self.client.execute("INCR", self.seq_key)
+        member = f"{seq}|{entry.encode()}"
+        # Index first: an entry that misses the log is still purged later
+        await self.client.execute("ZADD", self.expiry_key, entry.expires_at, member)
+        await self.client.execute("ZADD", self.key, seq, member)
+
+    async def fetch(self, cursor: int) -> Tuple[List[Revocation], int]:
+        entries: List[Revocation] = []
+        # Sequence numbers are taken before the ZADD, so a slow publisher
+        # can land behind the cursor; re-read a few (applying is idempotent)
+        after = max(0, cursor - _REFRESH_OVERLAP)
+        while True:
+            items = await self.client.execute(
+                "ZRANGEBYSCORE", self.key, f"({after}", "+inf", "LIMIT", 0, _FETCH_BATCH
+            )
+            for raw in items:
+                seq, _, encoded = raw.partition(b"|")
+                after = int(seq)
+                cursor = max(cursor, after)
+                entries.append(Revocation.decode(encoded))
+            if len(items) < _FETCH_BATCH:
+                now = time.time()
+                return [e for e in entries if e.expires_at > now], cursor
+
+    async def purge(self) -> None:
+        now = time.time()
+        while True:
+            members = await self.client.execute(
+                "ZRANGEBYSCORE", self.expiry_key, "-inf", now, "LIMIT", 0, _FETCH_BATCH
+            )
+            if not members:
+                return
+            await self.client.execute("ZREM", self.key, *members)
+            await self.client.execute("ZREM", self.expiry_key, *members)
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+class RevocationService:
+    """Publishes revocations and keeps this worker's list up to date"""
+
+    def __init__(self, source: Any, token_lifetime: float, refresh_interval: float):
+        self.source = source
+        self.token_lifetime = token_lifetime
+        self.refresh_interval = refresh_interval
+        self.revocations = RevocationList()
+        self._cursor = 0
+        self._task: Optional[asyncio.Task] = None
+        self._last_purge = 0.0
+
+    async def revoke_user(self, db: AsyncSession, user_id: int) -> None:
+        """Revoke every token of user_id issued until now"""
+        now = time.time()
+        await self._publish(db, Revocation("user", str(user_id), now, now + self.token_lifetime))
+
+    async def revoke_token(self, db: AsyncSession, claims: Dict[str, Any]) -> bool:
+        """Revoke one token by its jti; False for tokens without one"""
+        jti = claims.get("jti")
+        if jti is None:
+            return False
+        await self._publish(db, Revocation("jti", jti, time.time(), float(claims["exp"])))
+        return True
+
+    async def _publish(self, db: AsyncSession, entry: Revocation) -> None:
+        await self.source.publish(db, entry)
+        # Effective in this worker as soon as the other workers can see
+        # it: at once for Redis, after db commits for the table
+        if self.source.transactional:
+            db.info.setdefault(_PENDING, []).append(entry)
+        else:
+            self.revocations.add(entry)
+
+    async def refresh(self) -> int:
+        entries, self._cursor = await self.source.fetch(self._cursor)
+        self.revocations.extend(entries)
+        now = time.time()
+        if now - self._last_purge >= self.token_lifetime:
+            self._last_purge = now
+            self.revocations.compact(now)
+            await self.source.purge()
+        return len(entries)
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Failed to refresh token revocations: {e}")
+
+    async def start(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.error(f"Failed to load token revocations: {e}")
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.source.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"cursor": self._cursor, **self.revocations.stats()}
+
+
+def create_source(name: str) -> Any:
+    """Build a revocation source from its REVOCATION_DRIVER name"""
+    if name == "database":
+        return DatabaseSource()
+    if name == "redis":
+        client = RedisClient(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD,
+        )
+        return RedisSource(client, key=f"{settings.CACHE_PREFIX}:revocations")
+    raise ValueError(f"Unsupported revocation driver: {name}")
+
+
+_service: Optional[RevocationService] = None
+
+
+def get_revocation_service() -> RevocationService:
+    global _service
+    if _service is None:
+        _service = RevocationService(
+            create_source(settings.REVOCATION_DRIVER),
+            token_lifetime=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            refresh_interval=settings.REVOCATION_REFRESH_INTERVAL,
+        )
+    return _service
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed(session: Session) -> None:
+    entries = session.info.pop(_PENDING, None)
+    if entries and _service is not None:
+        for entry in entries:
+            _service.revocations.add(entry)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+async def close_revocation_service() -> None:
+    global _service
+    if _service is not None:
+        await _service.stop()
+        _service = None
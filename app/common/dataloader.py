@@ -0,0 +1,72 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Sequence, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+BatchFn = Callable[[List[K]], Awaitable[Dict[K, V]]]
+
+
+class DataLoader(Generic[K, V]):
+    """Batch and cache key lookups made during one request
+
+    Every load() issued in the same event-loop tick is collected and
+    resolved by a single call of batch_fn, which returns a key -> value
+    mapping (missing keys resolve to None). Results are cached for the
+    loader's lifetime, so create one loader per request.
+    """
+
+    def __init__(self, batch_fn: BatchFn, max_batch_size: int = 1000):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self._cache: Dict[K, asyncio.Future] = {}
+        self._queue: List[K] = []
+        self.batches = 0
+
+    async def load(self, key: K) -> Optional[V]:
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._cache[key] = loop.create_future()
+            if not self._queue:
+                loop.call_soon(self._dispatch)
+            self._queue.append(key)
+        return await future
+
+    async def load_many(self, keys: Sequence[K]) -> List[Optional[V]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: Optional[V]) -> None:
+        """Seed the cache with a value the caller already has"""
+        if key not in self._cache:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._cache[key] = future
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        for start in range(0, len(keys), self.max_batch_size):
+            asyncio.ensure_future(self._run(keys[start:start + self.max_batch_size]))
+
+    async def _run(self, keys: List[K]) -> None:
+        self.batches += 1
+        try:
+            values = await self.batch_fn(keys)
+        except BaseException as e:
+            for key in keys:
+                # Let a later load retry instead of caching the failure
+                future = self._cache.pop(key, None)
+                if future is None or future.done():
+                    continue
+                if isinstance(e, Exception):
+                    future.set_exception(e)
+                else:
+                    # Cancelled: waiters must not hang on a batch that will never finish
+                    future.cancel()
+            if not isinstance(e, Exception):
+                raise
+            return
+        for key in keys:
+            future = self._cache[key]
+            if not future.done():
+                future.set_result(values.get(key))
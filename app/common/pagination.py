@@ -0,0 +1,77 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+T = TypeVar("T")
+
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor we did not issue"""
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Encode the sort key of the last row into an opaque cursor"""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if not isinstance(values, dict):
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def _cursor_value(values: Dict[str, Any], key: InstrumentedAttribute) -> Any:
+    """The cursor's value for key, checked against the column's type"""
+    value = values.get(key.key)
+    python_type = key.type.python_type
+    # bool is an int subclass; JSON true/false never came from a key column
+    if isinstance(value, bool) or not isinstance(value, python_type):
+        raise InvalidCursor("Invalid cursor")
+    if python_type is int and not -2**63 <= value < 2**63:
+        raise InvalidCursor("Invalid cursor")
+    return value
+
+
+async def keyset_paginate(
+    db: AsyncSession,
+    stmt: Select,
+    key: InstrumentedAttribute,
+    cursor: Optional[str],
+    limit: int,
+) -> Tuple[List[Any], Optional[str]]:
+    """Fetch one page of stmt ordered by an indexed unique key
+
+    Seeks past the key stored in the cursor instead of using OFFSET, so
+    every page costs the same index range scan. An empty or missing
+    cursor starts from the first row.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if cursor:
+        stmt = stmt.where(key > _cursor_value(decode_cursor(cursor), key))
+
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(stmt.order_by(key).limit(limit + 1))
+    rows = list(result.scalars().all())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor({key.key: getattr(rows[-1], key.key)})
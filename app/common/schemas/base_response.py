@@ -1,7 +1,16 @@
 from pydantic import BaseModel
-from typing import Any
+from typing import Generic, Optional, TypeVar
 
-class BaseResponse(BaseModel):
+T = TypeVar("T")
+
+
+class BaseResponse(BaseModel, Generic[T]):
+    """Unified response envelope
+
+    Parametrize with the payload model, e.g. BaseResponse[User], so the
+    schema is documented and data is serialized by pydantic-core without
+    a generic encoding pass. Unparametrized, data accepts anything.
+    """
     code: int = 200
     msg: str = "success"
-    data: Any = None 
\ No newline at end of file
+    data: Optional[T] = None
@@ -0,0 +1,36 @@
+from typing import Any, Dict
+from fastapi import APIRouter, Depends, Request
+from cache import singleflight_stats
+from config.deps import get_current_active_superuser
+from config.hashing import get_hashing_pool
+from config.principal_cache import get_principal_cache
+from config.tokens import get_token_cache
+from database.pool import pool_status
+from database.session import get_engine, get_read_engine, replica_router
+from mail import get_mail_dispatcher
+from app.article.search import get_search_engine
+from app.auth.revocation import get_revocation_service
+from app.common.schemas.base_response import BaseResponse
+from sessions import get_session_store
+
+router = APIRouter(dependencies=[Depends(get_current_active_superuser)])
+
+
+@router.get("/stats", response_model=BaseResponse[Dict[str, Any]])
+async def runtime_stats(request: Request):
+    """Per-worker runtime statistics (pool, hashing, caches)"""
+    read_engine = get_read_engine()
+    return BaseResponse[Dict[str, Any]](data={
+        "db_pool": pool_status(get_engine().pool),
+        "db_read_pool": pool_status(read_engine.pool) if read_engine is not None else None,
+        "db_replica": replica_router.stats(),
+        "hashing": get_hashing_pool().stats(),
+        "principal_cache": get_principal_cache().stats(),
+        "token_cache": get_token_cache().stats(),
+        "revocations": get_revocation_service().stats(),
+        "singleflight": singleflight_stats(),
+        "mail": get_mail_dispatcher().stats(),
+        "search": get_search_engine().stats(),
+        "sessions": get_session_store().stats(),
+        "startup_ms": getattr(request.app.state, "startup_timings", None),
+    })
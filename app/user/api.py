@@ -1,66 +1,98 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional, Union
 from config.deps import get_current_active_user
-from database.session import get_db
-from . import services, schemas
+from config.principal_cache import get_principal_cache
+from app.auth.revocation import get_revocation_service
+from database.session import get_db, get_read_db
+from . import models, services, schemas
+from app.common.export import ExportFormat, export_response
+from app.common.pagination import CursorPage, InvalidCursor
 from app.common.schemas.base_response import BaseResponse
+from cache import cache_response, get_cache, response_cache_key
 
 router = APIRouter()
 
+UserResponse = BaseResponse[schemas.User]
+UserListResponse = BaseResponse[Union[CursorPage[schemas.User], List[schemas.User]]]
 
-@router.post("/", response_model=BaseResponse)
+
+@router.post("/", response_model=UserResponse)
 async def create_user(user: schemas.UserCreate, db: AsyncSession = Depends(get_db)):
     db_user = await services.get_user_by_email(db, email=user.email)
     if db_user:
-        return BaseResponse(code=400, msg="Email already registered")
+        return UserResponse(code=400, msg="Email already registered")
     user_obj = await services.create_user(db=db, user=user)
-    return BaseResponse(data=user_obj)
+    return UserResponse(data=user_obj)
 
 
-@router.get("/", response_model=BaseResponse)
+@router.get("/", response_model=UserListResponse)
 async def read_users(
     skip: int = 0, 
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_active_user)
 ):
-    """获取用户列表"""
+    """获取用户列表
+
+    Pass `cursor` (empty for the first page) to use keyset pagination;
+    the response then carries `next_cursor` instead of relying on `skip`.
+    """
+    if cursor is not None:
+        try:
+            users, next_cursor = await services.get_users_page(db, cursor=cursor, limit=limit)
+        except InvalidCursor:
+            return UserListResponse(code=400, msg="Invalid cursor")
+        return UserListResponse(data=CursorPage[schemas.User](items=users, next_cursor=next_cursor))
     users = await services.get_users(db, skip=skip, limit=limit)
-    return BaseResponse(data=users)
+    return UserListResponse(data=users)
 
 
-@router.get("/me", response_model=BaseResponse)
+@router.get("/export")
+async def export_users(
+    request: Request,
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    current_user = Depends(get_current_active_user)
+):
+    """导出用户列表 (NDJSON / CSV 流式输出)"""
+    stmt = select(models.User).order_by(models.User.id)
+    return export_response(request, stmt, schemas.User, fmt, filename="users")
+
+
+@router.get("/me", response_model=UserResponse)
 async def read_current_user(
     current_user = Depends(get_current_active_user)
 ):
     """获取当前登录用户信息"""
-    return BaseResponse(data=current_user)
+    return UserResponse(data=current_user)
 
 
-@router.get("/{user_id}", response_model=BaseResponse)
+@router.get("/{user_id}", response_model=UserResponse)
 async def read_user(
     user_id: int, 
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_active_user)
 ):
     """获取特定用户信息"""
-    user = await services.get_user(db, user_id=user_id)
+    user = await services.get_user_public(db, user_id=user_id)
     if user is None:
-        return BaseResponse(code=404, msg="User not found")
-    return BaseResponse(data=user)
+        return UserResponse(code=404, msg="User not found")
+    return UserResponse(data=user)
 
 
-@router.get("/{user_id}/profile", response_model=BaseResponse)
-async def get_user_profile(user_id: int, db: AsyncSession = Depends(get_db)):
+@router.get("/{user_id}/profile", response_model=UserResponse)
+@cache_response(ttl=60)
+async def get_user_profile(user_id: int, db: AsyncSession = Depends(get_read_db)):
     """获取用户详细资料"""
-    db_user = await services.get_user(db, user_id=user_id)
+    db_user = await services.get_user_public(db, user_id=user_id)
     if db_user is None:
-        return BaseResponse(code=404, msg="User not found")
-    return BaseResponse(data=db_user)
+        return UserResponse(code=404, msg="User not found")
+    return UserResponse(data=db_user)
 
 
-@router.put("/{user_id}/status", response_model=BaseResponse)
+@router.put("/{user_id}/status", response_model=UserResponse)
 async def update_user_status(
     user_id: int, 
     is_active: bool, 
@@ -69,8 +101,12 @@ async def update_user_status(
     """更新用户状态"""
     db_user = await services.get_user(db, user_id=user_id)
     if db_user is None:
-        return BaseResponse(code=404, msg="User not found")
+        return UserResponse(code=404, msg="User not found")
     db_user.is_active = is_active
+    # Issued tokens carry the old status in their claims
+    await get_revocation_service().revoke_user(db, user_id)
     await db.commit()
     await db.refresh(db_user)
-    return BaseResponse(data=db_user) 
\ No newline at end of file
+    get_principal_cache().invalidate(db_user.email)
+    await get_cache().delete(response_cache_key(f"/v1/users/{user_id}/profile"))
+    return UserResponse(data=db_user) 
\ No newline at end of file
@@ -0,0 +1,16 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.common.dataloader import DataLoader
+from database.session import get_read_db
+from . import models, services
+
+UserLoader = DataLoader[int, models.User]
+
+
+def create_user_loader(db: AsyncSession) -> UserLoader:
+    return DataLoader(lambda user_ids: services.get_users_by_ids(db, user_ids))
+
+
+async def get_user_loader(db: AsyncSession = Depends(get_read_db)) -> UserLoader:
+    """Request-scoped loader batching user lookups by id into one query"""
+    return create_user_loader(db)
@@ -13,7 +13,10 @@ class UserUpdate(UserBase):
     password: str | None = None
 
 
-class UserInDBBase(UserBase):
+class UserInDBBase(BaseModel):
+    # Stored emails were validated on input; re-running EmailStr
+    # validation on every response costs ~100us per user
+    email: str
     id: int
     is_active: bool
     is_superuser: bool
@@ -26,5 +29,14 @@ class User(UserInDBBase):
     pass
 
 
+class UserSummary(BaseModel):
+    """Author data embedded in other resources"""
+    id: int
+    email: str
+
+    class Config:
+        from_attributes = True
+
+
 class UserInDB(UserInDBBase):
     hashed_password: str 
\ No newline at end of file
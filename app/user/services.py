@@ -1,26 +1,68 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from config.security import get_password_hash, verify_password
-from . import models, schemas
+from sqlalchemy import Integer, any_, bindparam, select
+from sqlalchemy.dialects import postgresql
+from typing import Dict, Optional, Sequence
+from app.common.pagination import keyset_paginate
+from cache import singleflight
+from config.security import get_password_hash_async, verify_password_async
+from config.principal_cache import Principal
+from . import models, schemas, statements
 
 
 async def get_user(db: AsyncSession, user_id: int):
-    result = await db.execute(select(models.User).filter(models.User.id == user_id))
+    result = await db.execute(statements.USER_BY_ID, {"user_id": user_id})
     return result.scalar_one_or_none()
 
 
+async def get_principal(db: AsyncSession, user_id: int) -> Optional[Principal]:
+    """Column-only user lookup for read-only paths, no ORM entity"""
+    row = (await db.execute(statements.PRINCIPAL_BY_ID, {"user_id": user_id})).first()
+    return Principal.from_user(row) if row is not None else None
+
+
+async def get_principal_by_email(db: AsyncSession, email: str) -> Optional[Principal]:
+    """Column-only lookup used to authenticate bearer tokens"""
+    row = (await db.execute(statements.PRINCIPAL_BY_EMAIL, {"email": email})).first()
+    return Principal.from_user(row) if row is not None else None
+
+
+@singleflight()
+async def get_user_public(db: AsyncSession, user_id: int) -> Optional[schemas.User]:
+    """Read-only user lookup; concurrent calls for the same id share one query"""
+    principal = await get_principal(db, user_id)
+    return schemas.User.model_validate(principal) if principal is not None else None
+
+
+async def get_users_by_ids(db: AsyncSession, user_ids: Sequence[int]) -> Dict[int, models.User]:
+    """Users with the given ids in one query, keyed by id"""
+    if db.get_bind().dialect.name == "postgresql":
+        # One statement text for any number of ids, so asyncpg reuses
+        # the prepared statement instead of one per IN-list length
+        ids = bindparam("user_ids", list(user_ids), type_=postgresql.ARRAY(Integer))
+        condition = models.User.id == any_(ids)
+    else:
+        condition = models.User.id.in_(user_ids)
+    result = await db.execute(select(models.User).filter(condition))
+    return {user.id: user for user in result.scalars()}
+
+
 async def get_user_by_email(db: AsyncSession, email: str):
-    result = await db.execute(select(models.User).filter(models.User.email == email))
+    result = await db.execute(statements.USER_BY_EMAIL, {"email": email})
     return result.scalar_one_or_none()
 
 
 async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100):
-    result = await db.execute(select(models.User).offset(skip).limit(limit))
+    result = await db.execute(statements.USERS_OFFSET, {"skip": skip, "limit": limit})
     return result.scalars().all()
 
 
+async def get_users_page(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100):
+    """Keyset page of users ordered by primary key"""
+    return await keyset_paginate(db, select(models.User), models.User.id, cursor, limit)
+
+
 async def create_user(db: AsyncSession, user: schemas.UserCreate):
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     db_user = models.User(
         email=user.email,
         hashed_password=hashed_password
@@ -35,6 +77,6 @@ async def authenticate_user(db: AsyncSession, email: str, password: str):
     user = await get_user_by_email(db, email)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return False
     return user 
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""Prebuilt statements for the hot user queries
+
+Statements are constructed once at import with named bind parameters,
+so a call only binds values: no per-call select() construction, and the
+same statement object hits the engine's compiled cache every time.
+The column-only variants skip entity loading and the identity map for
+read-only paths such as authentication.
+"""
+from sqlalchemy import bindparam, select
+from database.warmup import register_hot_statement
+from .models import User
+
+USER_BY_ID = select(User).filter(User.id == bindparam("user_id"))
+USER_BY_EMAIL = select(User).filter(User.email == bindparam("email"))
+USERS_OFFSET = select(User).offset(bindparam("skip")).limit(bindparam("limit"))
+
+# Columns of config.principal_cache.Principal; rows go through Principal.from_user,
+# which coerces the nullable flags to bool
+PRINCIPAL_COLUMNS = (User.id, User.email, User.is_active, User.is_superuser)
+PRINCIPAL_BY_ID = select(*PRINCIPAL_COLUMNS).filter(User.id == bindparam("user_id"))
+PRINCIPAL_BY_EMAIL = select(*PRINCIPAL_COLUMNS).filter(User.email == bindparam("email"))
+
+# Authentication and profile lookups run on nearly every request
+register_hot_statement(USER_BY_EMAIL, {"email": ""})
+register_hot_statement(PRINCIPAL_BY_ID, {"user_id": 0})
+register_hot_statement(PRINCIPAL_BY_EMAIL, {"email": ""})
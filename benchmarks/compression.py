@@ -0,0 +1,57 @@
+"""Compression ratio and cost per codec and level on real response bodies
+
+Renders /openapi.json and a 100-article list page from the application
+and compresses each with every available codec at a few levels.
+
+    python -m benchmarks.compression [--number 50]
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict
+from middlewares.compression import CODECS
+
+
+def _bodies() -> Dict[str, bytes]:
+    from app.article.schemas import ArticleWithAuthor
+    from app.common.responses import FastJSONResponse
+    from app.common.schemas.base_response import BaseResponse
+    from main import get_application
+
+    now = datetime.now()
+    articles = [
+        ArticleWithAuthor(id=i, title=f"Article {i}", content="lorem ipsum dolor sit amet " * 20,
+                          author_id=i % 50, created_at=now, updated_at=now)
+        for i in range(100)
+    ]
+    return {
+        "/openapi.json": json.dumps(get_application().openapi()).encode(),
+        "GET /v1/articles/ (100)": FastJSONResponse(BaseResponse(data=articles)).body,
+    }
+
+
+def main(number: int) -> Dict[str, Any]:
+    report: Dict[str, Any] = {}
+    for name, body in _bodies().items():
+        results: Dict[str, Any] = {"bytes": len(body)}
+        for encoding, (factory, default, (low, high), heavy) in CODECS.items():
+            for level in sorted({low if low > 0 else 1, default, heavy, high}):
+                start = time.perf_counter()
+                for _ in range(number):
+                    compressed = factory(level).finish(body)
+                elapsed = (time.perf_counter() - start) / number
+                results[f"{encoding}-{level}"] = {
+                    "ratio": round(len(body) / len(compressed), 2),
+                    "us": round(elapsed * 1e6, 1),
+                    "mb_per_s": round(len(body) / elapsed / 2**20, 1),
+                }
+        report[name] = results
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=50, help="compressions per codec and level")
+    args = parser.parse_args()
+    print(json.dumps(main(args.number), indent=2))
@@ -0,0 +1,66 @@
+"""Import-time report aggregated per top-level package
+
+Runs ``python -X importtime`` in a fresh interpreter and sums each
+module's self time into its top-level package, so the cost of the
+app's own packages and of each third-party dependency is visible.
+
+    python -m benchmarks.importtime
+    python -m benchmarks.importtime --target "import main; main.app" --top 15
+"""
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+
+def measure(target: str) -> List[Tuple[str, int, int]]:
+    """(module, self_us, cumulative_us) for every module imported by target"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", target],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def aggregate(rows: List[Tuple[str, int, int]]) -> Dict[str, Dict[str, int]]:
+    packages: Dict[str, Dict[str, int]] = defaultdict(lambda: {"self_us": 0, "modules": 0})
+    for name, self_us, _ in rows:
+        package = packages[name.split(".")[0]]
+        package["self_us"] += self_us
+        package["modules"] += 1
+    return dict(sorted(packages.items(), key=lambda item: item[1]["self_us"], reverse=True))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", default="import main", help="code to profile")
+    parser.add_argument("--top", type=int, default=25, help="packages to report")
+    parser.add_argument("--repeat", type=int, default=3, help="runs to take the fastest of")
+    args = parser.parse_args()
+
+    runs = [aggregate(measure(args.target)) for _ in range(args.repeat)]
+    packages = min(runs, key=lambda run: sum(p["self_us"] for p in run.values()))
+    total_us = sum(p["self_us"] for p in packages.values())
+    print(json.dumps({
+        "target": args.target,
+        "total_ms": round(total_us / 1000, 1),
+        "packages": {
+            name: {"self_ms": round(p["self_us"] / 1000, 1), "modules": p["modules"]}
+            for name, p in list(packages.items())[:args.top]
+        },
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""Reproducible in-process load test of the API
+
+Boots main.app against a throwaway SQLite database (or --database-url),
+seeds users and articles, drives each endpoint with a concurrent async
+load generator over ASGI and reports latency percentiles and RPS as JSON.
+
+    python -m benchmarks.loadtest --output bench.json
+    python -m benchmarks.loadtest --compare bench.json --margin 0.15
+
+With --compare the run exits with status 1 when any endpoint's p95 is
+above, or its RPS below, the baseline by more than the margin.
+
+--database-url must name an empty database: the benchmark refuses to
+seed one that already has tables unless --reset-database is given, which
+drops every table of the app's models first.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+SEED_PASSWORD = "bench-password"
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def _seed(users: int, articles: int, reset: bool) -> None:
+    from sqlalchemy import insert, inspect
+    from app.article.models import Article
+    from app.user.models import User
+    from config.security import get_password_hash
+    from database.base import Base
+    from database.session import get_engine, get_sessionmaker
+
+    async with get_engine().begin() as conn:
+        if reset:
+            await conn.run_sync(Base.metadata.drop_all)
+        else:
+            tables = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names())
+            if tables:
+                raise SystemExit(
+                    f"Refusing to seed a database that has tables ({', '.join(sorted(tables))}); "
+                    "pass --reset-database to drop them"
+                )
+        await conn.run_sync(Base.metadata.create_all)
+
+    # One bcrypt hash shared by every seeded user keeps seeding fast
+    hashed = get_password_hash(SEED_PASSWORD)
+    async with get_sessionmaker()() as session:
+        rows = [
+            {"email": f"bench{i}@example.com", "hashed_password": hashed,
+             "is_active": True, "is_superuser": i == 0}
+            for i in range(users)
+        ]
+        for start in range(0, len(rows), 1000):
+            await session.execute(insert(User).values(rows[start:start + 1000]))
+        rows = [
+            {"title": f"Article {i}", "content": "lorem ipsum dolor sit amet " * 20,
+             "author_id": i % users + 1}
+            for i in range(articles)
+        ]
+        for start in range(0, len(rows), 1000):
+            await session.execute(insert(Article).values(rows[start:start + 1000]))
+        await session.commit()
+
+
+async def _drive(
+    request: Callable[[int], Awaitable[Any]],
+    total: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    """Issue total requests from concurrency workers and summarize latency"""
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            response = await request(i)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400 or response.json().get("code", 200) >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+    from main import get_application
+
+    app = get_application()
+
+    await _seed(args.users, args.articles, args.reset_database)
+    report: Dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "database": os.environ["SQLALCHEMY_DATABASE_URI"].split("://")[0],
+            "users": args.users,
+            "articles": args.articles,
+        },
+        "endpoints": {},
+    }
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await client.post(
+                "/v1/auth/login",
+                data={"username": "bench0@example.com", "password": SEED_PASSWORD},
+            )
+            token = response.json()["data"]["access_token"]
+            auth = {"Authorization": f"Bearer {token}"}
+
+            scenarios: Dict[str, Callable[[int], Awaitable[Any]]] = {
+                "POST /v1/auth/login": lambda i: client.post(
+                    "/v1/auth/login",
+                    data={"username": f"bench{i % args.users}@example.com", "password": SEED_PASSWORD},
+                ),
+                "GET /v1/users/me": lambda i: client.get("/v1/users/me", headers=auth),
+                "GET /v1/users/": lambda i: client.get("/v1/users/", params={"limit": 20}, headers=auth),
+                "GET /v1/articles/": lambda i: client.get("/v1/articles/", params={"limit": 20}),
+                "GET /v1/articles/{article_id}": lambda i: client.get(
+                    f"/v1/articles/{i % args.articles + 1}"
+                ),
+            }
+            for name, request in scenarios.items():
+                if args.endpoints and not any(e in name for e in args.endpoints):
+                    continue
+                # bcrypt dominates login, so it gets a smaller request budget
+                total = max(1, args.requests // 10) if "login" in name else args.requests
+                report["endpoints"][name] = await _drive(request, total, args.concurrency)
+    return report
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], margin: float) -> List[str]:
+    """Regressions of report against baseline beyond margin"""
+    failures = []
+    for name, current in report["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if previous is None:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + margin):
+            failures.append(f"{name}: p95 {current['p95_ms']}ms > baseline {previous['p95_ms']}ms")
+        if current["rps"] < previous["rps"] * (1 - margin):
+            failures.append(f"{name}: rps {current['rps']} < baseline {previous['rps']}")
+        if current["errors"] > previous["errors"]:
+            failures.append(f"{name}: errors {current['errors']} > baseline {previous['errors']}")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--database-url",
+        help="an empty database to seed; defaults to a temporary SQLite file",
+    )
+    parser.add_argument(
+        "--reset-database",
+        action="store_true",
+        help="drop every app table in --database-url before seeding (destroys its data)",
+    )
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--endpoints", nargs="*", help="only run endpoints containing these strings")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument("--margin", type=float, default=0.10, help="allowed regression, 0.10 = 10%%")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="llama-bench-")
+    # Settings are read at import time, so configure the app before importing it
+    os.environ["SQLALCHEMY_DATABASE_URI"] = (
+        args.database_url or f"sqlite+aiosqlite:///{workdir}/bench.db"
+    )
+    os.environ.setdefault("APP_DEBUG", "false")
+    os.environ.setdefault("CACHE_DRIVER", "memory")
+    os.environ.setdefault("ACCESS_LOG_SAMPLE_RATE", "0")
+    # Every simulated client shares one address, so the per-IP login limit is off
+    os.environ.setdefault("RATE_LIMIT_LOGIN_IP", "")
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+    if args.compare:
+        with open(args.compare) as f:
+            failures = compare(report, json.load(f), args.margin)
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""Mail outbox throughput against a local SMTP server (aiosmtpd)
+
+Queues --messages rows in a throwaway SQLite outbox, lets the dispatcher
+deliver them to an in-process aiosmtpd server and reports throughput,
+queue lag and SMTP connections opened. For comparison it also sends
+messages inline with a fresh connection each, as a request handler
+without the outbox would. --handshake-ms delays EHLO to stand in for
+the TLS and AUTH round trips of a remote server.
+
+    python -m benchmarks.mail [--messages 2000] [--workers 2] [--batch 20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import smtplib
+import socket
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+
+class _Handler:
+    """Counts messages; runs on the aiosmtpd controller's own thread and loop"""
+
+    def __init__(self, handshake: float, expected: int, on_complete):
+        self.handshake = handshake
+        self.expected = expected
+        self.on_complete = on_complete
+        self.received = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        await asyncio.sleep(self.handshake)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        if self.received == self.expected:
+            self.on_complete()
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values), max(1, int(round(pct / 100 * len(values))))) - 1]
+
+
+async def run(args: argparse.Namespace, port: int) -> Dict[str, Any]:
+    from aiosmtpd.controller import Controller
+    from sqlalchemy import select
+    from database.base import Base
+    from database.session import get_engine, get_sessionmaker
+    from mail.message import Mail, build_message, sender
+    from mail.models import OutboxMessage
+    from mail.outbox import MailDispatcher, queue_mail
+    from mail.transport import SMTPPool
+
+    loop = asyncio.get_running_loop()
+    delivered = asyncio.Event()
+    handler = _Handler(
+        args.handshake_ms / 1000, args.messages, lambda: loop.call_soon_threadsafe(delivered.set)
+    )
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        async with get_engine().begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        mails = [Mail(f"user{i}@example.com", f"Message {i}", "hello " * 50) for i in range(args.messages)]
+        started = time.perf_counter()
+        async with get_sessionmaker()() as db:
+            for mail in mails:
+                queue_mail(db, mail)
+            await db.commit()
+        queue_us = (time.perf_counter() - started) / len(mails) * 1e6
+
+        pool = SMTPPool("127.0.0.1", port, size=args.pool)
+        dispatcher = MailDispatcher(pool, workers=args.workers, batch_size=args.batch, poll_interval=0.05)
+        started = time.perf_counter()
+        dispatcher.start()
+        await asyncio.wait_for(delivered.wait(), timeout=args.timeout)
+        elapsed = time.perf_counter() - started
+        await dispatcher.stop()
+
+        async with get_sessionmaker()() as db:
+            rows = (await db.execute(
+                select(OutboxMessage.created_at, OutboxMessage.sent_at).filter(OutboxMessage.status == "sent")
+            )).all()
+        lags = [sent - created for created, sent in rows]
+
+        # Inline baseline: one connection per message, on the caller's time
+        inline = min(len(mails), args.inline)
+        from_header = sender()
+
+        def send_inline(mail: Mail) -> None:
+            with smtplib.SMTP("127.0.0.1", port, timeout=10) as conn:
+                conn.send_message(build_message(mail, from_header))
+
+        started = time.perf_counter()
+        for mail in mails[:inline]:
+            await asyncio.to_thread(send_inline, mail)
+        inline_elapsed = time.perf_counter() - started
+    finally:
+        controller.stop()
+
+    return {
+        "messages": len(mails),
+        "workers": args.workers,
+        "batch": args.batch,
+        "pool": args.pool,
+        "handshake_ms": args.handshake_ms,
+        "queue_us_per_message": round(queue_us, 1),
+        "outbox": {
+            "sent": len(rows),
+            "messages_per_s": round(len(mails) / elapsed, 1),
+            "lag_p50_ms": round(_percentile(lags, 50) * 1000, 1),
+            "lag_p95_ms": round(_percentile(lags, 95) * 1000, 1),
+            "smtp_connects": pool.connects,
+            "smtp_reuses": pool.reuses,
+        },
+        "inline": {
+            "sent": inline,
+            "messages_per_s": round(inline / inline_elapsed, 1) if inline else 0.0,
+            "ms_per_request": round(inline_elapsed / inline * 1000, 2) if inline else 0.0,
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--batch", type=int, default=20)
+    parser.add_argument("--pool", type=int, default=2)
+    parser.add_argument("--handshake-ms", type=float, default=20, help="simulated TLS/AUTH cost per connection")
+    parser.add_argument("--inline", type=int, default=200, help="messages for the inline baseline")
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="llama-mail-bench-")
+    # Settings are read at import time, so configure the app before importing it
+    os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite+aiosqlite:///{workdir}/mail.db"
+    os.environ.setdefault("APP_DEBUG", "false")
+    os.environ.setdefault("MAIL_FROM_ADDRESS", "bench@example.com")
+
+    print(json.dumps(asyncio.run(run(args, _free_port())), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Micro-benchmark of the response serialization path per endpoint shape
+
+Compares the untyped envelope (response_model=BaseResponse, data built
+as dicts, stdlib JSONResponse) with the typed envelope
+(BaseResponse[T] built from ORM-like objects, FastJSONResponse), and
+with returning FastJSONResponse(model) directly.
+
+    python -m benchmarks.serialization [--number 2000]
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Union
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from app.article.schemas import Article
+from app.common.pagination import CursorPage
+from app.common.responses import FastJSONResponse
+from app.common.schemas.base_response import BaseResponse
+from app.user.schemas import User
+
+
+def _users(n: int) -> List[SimpleNamespace]:
+    return [
+        SimpleNamespace(id=i, email=f"user{i}@example.com", hashed_password="x" * 60,
+                        is_active=True, is_superuser=False)
+        for i in range(n)
+    ]
+
+
+def _articles(n: int) -> List[SimpleNamespace]:
+    now = datetime.now()
+    return [
+        SimpleNamespace(id=i, title=f"Article {i}", content="lorem ipsum " * 40,
+                        author_id=i % 50, created_at=now, updated_at=now)
+        for i in range(n)
+    ]
+
+
+def _response_field(model: Any):
+    return APIRoute("/", lambda: None, response_model=model).response_field
+
+
+async def _through_fastapi(field, build: Callable[[], Any], response_class) -> bytes:
+    content = await serialize_response(field=field, response_content=build())
+    return response_class(content).body
+
+
+def _cases() -> Dict[str, Dict[str, Callable[[], Any]]]:
+    one_user = _users(1)[0]
+    users = _users(100)
+    articles = _articles(100)
+    user_fields = list(User.model_fields)
+    article_fields = list(Article.model_fields)
+    # Same envelope types as app.user.api / app.article.api
+    UserResponse = BaseResponse[User]
+    UserListResponse = BaseResponse[Union[CursorPage[User], List[User]]]
+    ArticleListResponse = BaseResponse[Union[CursorPage[Article], List[Article]]]
+    untyped = _response_field(BaseResponse)
+    user_typed = _response_field(UserResponse)
+    users_typed = _response_field(UserListResponse)
+    articles_typed = _response_field(ArticleListResponse)
+
+    def as_dict(obj: Any, fields: List[str]) -> Dict[str, Any]:
+        return {f: getattr(obj, f) for f in fields}
+
+    return {
+        "GET /v1/users/me": {
+            "before": lambda: _through_fastapi(
+                untyped, lambda: BaseResponse(data=as_dict(one_user, user_fields)), JSONResponse),
+            "after": lambda: _through_fastapi(
+                user_typed, lambda: UserResponse(data=one_user), FastJSONResponse),
+            "direct": lambda: FastJSONResponse(UserResponse(data=one_user)).body,
+        },
+        "GET /v1/users/ (100)": {
+            "before": lambda: _through_fastapi(
+                untyped, lambda: BaseResponse(data=[as_dict(u, user_fields) for u in users]), JSONResponse),
+            "after": lambda: _through_fastapi(
+                users_typed, lambda: UserListResponse(data=users), FastJSONResponse),
+            "direct": lambda: FastJSONResponse(UserListResponse(data=users)).body,
+        },
+        "GET /v1/articles/ (100)": {
+            "before": lambda: _through_fastapi(
+                untyped, lambda: BaseResponse(data=[as_dict(a, article_fields) for a in articles]), JSONResponse),
+            "after": lambda: _through_fastapi(
+                articles_typed, lambda: ArticleListResponse(data=articles), FastJSONResponse),
+            "direct": lambda: FastJSONResponse(ArticleListResponse(data=articles)).body,
+        },
+    }
+
+
+async def _measure(func: Callable[[], Any], number: int) -> float:
+    for _ in range(min(number, 100)):
+        result = func()
+        if asyncio.iscoroutine(result):
+            await result
+    start = time.perf_counter()
+    for _ in range(number):
+        result = func()
+        if asyncio.iscoroutine(result):
+            await result
+    return (time.perf_counter() - start) / number * 1e6
+
+
+async def main(number: int) -> Dict[str, Dict[str, float]]:
+    report: Dict[str, Dict[str, float]] = {}
+    for endpoint, variants in _cases().items():
+        report[endpoint] = {
+            f"{name}_us": round(await _measure(func, number), 2) for name, func in variants.items()
+        }
+        report[endpoint]["speedup"] = round(report[endpoint]["before_us"] / report[endpoint]["after_us"], 2)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="calls per variant")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main(args.number)), indent=2))
@@ -0,0 +1,104 @@
+"""Memory footprint and cost of the in-process session store
+
+Fills a MemoryStore with --sessions sessions of a typical payload (user
+id, CSRF token, flash message) and reports the bytes it holds, measured
+with tracemalloc, next to a naive store of cookie string -> (expiry,
+dict). It also times load and save of existing sessions, and a sweep
+that expires every session at once.
+
+    python -m benchmarks.sessions_memory [--sessions 1000000] [--number 200000]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import secrets
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+from sessions.memory import MemoryStore
+from sessions.session import dumps, encode_session_id, new_session_id
+
+
+def _payload(i: int) -> Dict[str, Any]:
+    return {"user_id": i, "csrf": secrets.token_urlsafe(16), "flash": None}
+
+
+def _allocated(build: Callable[[], Any]) -> Any:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        built = build()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return built, size
+
+
+async def _time(func: Callable[[bytes], Any], sids: List[bytes], number: int) -> float:
+    start = time.perf_counter()
+    for i in range(number):
+        await func(sids[i % len(sids)])
+    return (time.perf_counter() - start) / number * 1e9
+
+
+async def run(sessions: int, number: int) -> Dict[str, Any]:
+    sids = [new_session_id() for _ in range(sessions)]
+    payloads = [dumps(_payload(i)) for i in range(sessions)]
+
+    def build_store() -> MemoryStore:
+        store = MemoryStore(lifetime=7200)
+        generation = store._generations[-1]
+        # Same as awaiting save() for new ids, without a coroutine per session
+        for sid, data in zip(sids, payloads):
+            generation[sid] = data
+        return store
+
+    def build_naive() -> Dict[str, Any]:
+        expires_at = time.time() + 7200
+        return {encode_session_id(sid): (expires_at, _payload(i)) for i, sid in enumerate(sids)}
+
+    # Ids and payloads were allocated before tracing started; add them
+    shared_bytes = sum(sys.getsizeof(sid) + sys.getsizeof(data) for sid, data in zip(sids, payloads))
+    store, store_bytes = _allocated(build_store)
+    store_bytes += shared_bytes
+    naive, naive_bytes = _allocated(build_naive)
+    del naive
+    gc.collect()
+
+    load_ns = await _time(store.load, sids, number)
+    data = payloads[0]
+    save_ns = await _time(lambda sid: store.save(sid, data), sids, number)
+
+    for _ in range(store._generations.maxlen - 1):
+        await store.sweep()
+    start = time.perf_counter()
+    expired = await store.sweep()
+    sweep_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "sessions": sessions,
+        "payload_bytes_avg": round(sum(len(data) for data in payloads) / sessions, 1),
+        "memory_store": {
+            "mb": round(store_bytes / 2**20, 1),
+            "bytes_per_session": round(store_bytes / sessions, 1),
+            "load_ns": round(load_ns, 1),
+            "save_ns": round(save_ns, 1),
+            "sweep_expired": expired,
+            "sweep_ms": round(sweep_ms, 1),
+        },
+        "naive_dict": {
+            "mb": round(naive_bytes / 2**20, 1),
+            "bytes_per_session": round(naive_bytes / sessions, 1),
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1000000)
+    parser.add_argument("--number", type=int, default=200000, help="timed loads and saves")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.sessions, args.number)), indent=2))
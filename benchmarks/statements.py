@@ -0,0 +1,98 @@
+"""Per-call cost of the hot user queries: inline select() vs prebuilt statements
+
+Seeds a throwaway SQLite database and runs each lookup through an
+AsyncSession the way app.user.services does. "before" builds the
+select() per call and loads ORM entities (the previous implementation),
+"after" uses app.user.statements; auth lookups compare loading the
+entity plus Principal.from_user with the column-only query.
+
+    python -m benchmarks.statements [--number 5000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+
+async def _measure(func: Callable[[], Awaitable[Any]], number: int) -> Dict[str, float]:
+    for _ in range(min(number, 200)):
+        await func()
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    for _ in range(number):
+        await func()
+    return {
+        "wall_us": (time.perf_counter() - wall) / number * 1e6,
+        "cpu_us": (time.process_time() - cpu) / number * 1e6,
+    }
+
+
+async def main(number: int) -> Dict[str, Dict[str, float]]:
+    from sqlalchemy import insert, select
+    from app.user import services
+    from app.user.models import User
+    from config.principal_cache import Principal
+    from database.base import Base
+    from database.session import get_engine, get_sessionmaker
+
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User).values([
+            {"email": f"user{i}@example.com", "hashed_password": "x" * 60,
+             "is_active": True, "is_superuser": False}
+            for i in range(200)
+        ]))
+
+    async def before_get_user(db):
+        result = await db.execute(select(User).filter(User.id == 42))
+        return result.scalar_one_or_none()
+
+    async def before_by_email(db):
+        result = await db.execute(select(User).filter(User.email == "user42@example.com"))
+        return result.scalar_one_or_none()
+
+    async def before_get_users(db):
+        result = await db.execute(select(User).offset(0).limit(100))
+        return result.scalars().all()
+
+    async def before_principal(db):
+        return Principal.from_user(await before_by_email(db))
+
+    cases = {
+        "get_user": (before_get_user, lambda db: services.get_user(db, 42)),
+        "get_user_by_email": (before_by_email, lambda db: services.get_user_by_email(db, "user42@example.com")),
+        "get_users (100)": (before_get_users, lambda db: services.get_users(db, 0, 100)),
+        "auth principal lookup": (
+            before_principal,
+            lambda db: services.get_principal_by_email(db, "user42@example.com"),
+        ),
+    }
+
+    report: Dict[str, Dict[str, float]] = {}
+    for name, (before, after) in cases.items():
+        row: Dict[str, float] = {}
+        for label, func in (("before", before), ("after", after)):
+            # A fresh session per call, as each request gets its own
+            async def call():
+                async with get_sessionmaker()() as db:
+                    await func(db)
+
+            for key, value in (await _measure(call, number)).items():
+                row[f"{label}_{key}"] = round(value, 1)
+        row["cpu_reduction"] = f"{1 - row['after_cpu_us'] / row['before_cpu_us']:.0%}"
+        report[name] = row
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=5000, help="calls per variant")
+    args = parser.parse_args()
+    workdir = tempfile.mkdtemp(prefix="llama-bench-")
+    # Settings are read at import time, so configure them before importing the app
+    os.environ.setdefault("SQLALCHEMY_DATABASE_URI", f"sqlite+aiosqlite:///{workdir}/bench.db")
+    os.environ.setdefault("APP_DEBUG", "false")
+    print(json.dumps(asyncio.run(main(args.number)), indent=2))
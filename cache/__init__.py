@@ -0,0 +1,3 @@
+from .manager import Cache, close_cache, get_cache
+from .response import cache_response, response_cache_key
+from .singleflight import singleflight, singleflight_stats
@@ -0,0 +1,23 @@
+from typing import Optional
+
+
+class CacheDriver:
+    """Interface every cache driver implements
+
+    Values are raw bytes; serialization is the caller's concern.
+    """
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release driver resources"""
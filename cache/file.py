@@ -0,0 +1,61 @@
+import asyncio
+import hashlib
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Optional
+from .base import CacheDriver
+
+# Each file starts with the absolute expiry time (0 means no expiry)
+_HEADER = struct.Struct(">d")
+
+
+class FileDriver(CacheDriver):
+    """Cache stored as one file per key, shared by all workers on a host"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def _file(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return self.path / digest[:2] / digest
+
+    def _read(self, key: str) -> Optional[bytes]:
+        file = self._file(key)
+        try:
+            data = file.read_bytes()
+        except FileNotFoundError:
+            return None
+        (expires_at,) = _HEADER.unpack_from(data)
+        if expires_at and expires_at <= time.time():
+            file.unlink(missing_ok=True)
+            return None
+        return data[_HEADER.size:]
+
+    def _write(self, key: str, value: bytes, ttl: Optional[int]) -> None:
+        file = self._file(key)
+        file.parent.mkdir(parents=True, exist_ok=True)
+        expires_at = time.time() + ttl if ttl else 0.0
+        # Write then rename so readers never see a partial file
+        tmp = file.with_name(f"{file.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(_HEADER.pack(expires_at) + value)
+        os.replace(tmp, file)
+
+    def _clear(self) -> None:
+        if not self.path.exists():
+            return
+        for file in self.path.glob("*/*"):
+            file.unlink(missing_ok=True)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        await asyncio.to_thread(self._write, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._file(key).unlink, True)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._clear)
@@ -0,0 +1,67 @@
+from typing import Optional
+from config.config import settings
+from .base import CacheDriver
+from .file import FileDriver
+from .memory import MemoryDriver
+from .redis import RedisClient, RedisDriver
+
+
+class Cache:
+    """Cache facade that namespaces every key with CACHE_PREFIX"""
+
+    def __init__(self, driver: CacheDriver, prefix: str = ""):
+        self.driver = driver
+        self.prefix = f"{prefix}:" if prefix else ""
+
+    def key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.driver.get(self.key(key))
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        await self.driver.set(self.key(key), value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await self.driver.delete(self.key(key))
+
+    async def clear(self) -> None:
+        await self.driver.clear()
+
+    async def close(self) -> None:
+        await self.driver.close()
+
+
+def create_driver(name: str, prefix: str = "") -> CacheDriver:
+    """Build a cache driver from its CACHE_DRIVER name"""
+    if name == "memory":
+        return MemoryDriver(maxsize=settings.CACHE_MAX_ENTRIES)
+    if name == "file":
+        return FileDriver(settings.CACHE_PATH)
+    if name == "redis":
+        client = RedisClient(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD,
+        )
+        return RedisDriver(client, prefix=prefix)
+    raise ValueError(f"Unsupported cache driver: {name}")
+
+
+_cache: Optional[Cache] = None
+
+
+def get_cache() -> Cache:
+    """Get the process-wide cache configured by CACHE_DRIVER"""
+    global _cache
+    if _cache is None:
+        prefix = settings.CACHE_PREFIX
+        _cache = Cache(create_driver(settings.CACHE_DRIVER, prefix=f"{prefix}:"), prefix)
+    return _cache
+
+
+async def close_cache() -> None:
+    global _cache
+    if _cache is not None:
+        await _cache.close()
+        _cache = None
@@ -0,0 +1,133 @@
+import asyncio
+from typing import Any, List, Optional, Tuple, Union
+from .base import CacheDriver
+
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class RedisError(Exception):
+    """Error reply returned by the server"""
+
+
+class RedisClient:
+    """Minimal pooled RESP2 client
+
+    Speaks only the wire protocol, so it works against Redis and any
+    protocol-compatible stand-in without an extra dependency.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 6379,
+        password: Optional[str] = None,
+        max_connections: int = 10,
+    ):
+        self.host = host
+        self.port = port
+        self.password = password
+        self._idle: List[Connection] = []
+        self._slots = asyncio.BoundedSemaphore(max_connections)
+
+    async def _connect(self) -> Connection:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            writer.write(self._encode(("AUTH", self.password)))
+            await writer.drain()
+            await self._read_reply(reader)
+        return reader, writer
+
+    @staticmethod
+    def _encode(args: Tuple[Any, ...]) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if isinstance(arg, bytes):
+                data = arg
+            else:
+                data = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    async def _read_reply(self, reader: asyncio.StreamReader) -> Any:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload
+        if kind == b"-":
+            raise RedisError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            return (await reader.readexactly(length + 2))[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [await self._read_reply(reader) for _ in range(length)]
+        raise RedisError(f"Unexpected reply type: {line!r}")
+
+    async def execute(self, *args: Union[str, bytes, int, float]) -> Any:
+        """Send one command and return its decoded reply"""
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else await self._connect()
+            reader, writer = conn
+            try:
+                writer.write(self._encode(args))
+                await writer.drain()
+                reply = await self._read_reply(reader)
+            except RedisError:
+                self._idle.append(conn)
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            self._idle.append(conn)
+            return reply
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+
+class RedisDriver(CacheDriver):
+    """Cache stored in a Redis-protocol server"""
+
+    def __init__(self, client: RedisClient, prefix: str = ""):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.execute("GET", key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        if ttl:
+            await self.client.execute("SET", key, value, "EX", ttl)
+        else:
+            await self.client.execute("SET", key, value)
+
+    async def delete(self, key: str) -> None:
+        await self.client.execute("DEL", key)
+
+    async def clear(self) -> None:
+        cursor = b"0"
+        while True:
+            cursor, keys = await self.client.execute(
+                "SCAN", cursor, "MATCH", f"{self.prefix}*", "COUNT", 500
+            )
+            if keys:
+                await self.client.execute("DEL", *keys)
+            if cursor == b"0":
+                break
+
+    async def close(self) -> None:
+        await self.client.close()
@@ -0,0 +1,112 @@
+import asyncio
+import hashlib
+import inspect
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+from fastapi import Request
+from fastapi.responses import Response
+from app.common.schemas.base_response import BaseResponse
+from .manager import get_cache
+
+_REQUEST_PARAM = "_cache_request"
+
+# Per-key locks so only one request recomputes a missing entry
+_locks: Dict[str, asyncio.Lock] = {}
+_waiters: Dict[str, int] = {}
+
+
+def response_cache_key(path: str, query: str = "") -> str:
+    """Cache key of a GET response, used for explicit invalidation"""
+    return f"response:{path}?{query}" if query else f"response:{path}"
+
+
+def _request_key(request: Request) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return response_cache_key(request.url.path, query)
+
+
+def _etag(body: bytes) -> str:
+    return '"%s"' % hashlib.blake2b(body, digest_size=12).hexdigest()
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates or "*" in candidates
+
+
+def _build_response(request: Request, body: bytes) -> Response:
+    etag = _etag(body)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cache_response(ttl: int, negative_ttl: int = 5) -> Callable:
+    """Cache successful BaseResponse bodies of a GET endpoint for ttl seconds
+
+    404 envelopes are cached for negative_ttl seconds (0 disables), so a
+    burst of requests for a missing id costs one lookup instead of one
+    per queued waiter. Responses carry an ETag and honour If-None-Match
+    with 304. Only public, non user-specific endpoints should be cached:
+    the key is built from the path and query string only.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        request_param = next(
+            (name for name, p in signature.parameters.items() if p.annotation is Request),
+            None,
+        )
+
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if request_param is None:
+                request: Request = kwargs.pop(_REQUEST_PARAM)
+            else:
+                request = kwargs[request_param]
+
+            cache = get_cache()
+            key = _request_key(request)
+            body: Optional[bytes] = await cache.get(key)
+            if body is not None:
+                return _build_response(request, body)
+
+            lock = _locks.setdefault(key, asyncio.Lock())
+            _waiters[key] = _waiters.get(key, 0) + 1
+            try:
+                async with lock:
+                    # Another request may have filled the entry while we waited
+                    body = await cache.get(key)
+                    if body is None:
+                        result = await func(*args, **kwargs)
+                        if not isinstance(result, BaseResponse):
+                            return result
+                        if result.code == 200:
+                            entry_ttl = ttl
+                        elif result.code == 404 and negative_ttl:
+                            entry_ttl = negative_ttl
+                        else:
+                            return result
+                        body = result.model_dump_json().encode()
+                        await cache.set(key, body, entry_ttl)
+            finally:
+                _waiters[key] -= 1
+                if not _waiters[key]:
+                    del _waiters[key]
+                    del _locks[key]
+            return _build_response(request, body)
+
+        if request_param is None:
+            extra = inspect.Parameter(
+                _REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request
+            )
+            wrapper.__signature__ = signature.replace(
+                parameters=[*signature.parameters.values(), extra]
+            )
+        return wrapper
+
+    return decorator
@@ -0,0 +1,145 @@
+import asyncio
+import inspect
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, TypeVar
+from metrics.collectors import SINGLEFLIGHT_CALLS, SINGLEFLIGHT_EXECUTIONS, SINGLEFLIGHT_FAN_IN
+
+T = TypeVar("T")
+
+# Keys tracked for the per-key fan-in report before pruning to the hottest
+_MAX_TRACKED_KEYS = 1000
+_KEPT_KEYS = 100
+
+
+class _LeaderCancelled(Exception):
+    """The caller executing the shared call went away before finishing"""
+
+
+class _Call:
+    __slots__ = ("future", "fan_in")
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.fan_in = 1
+
+
+class SingleFlight:
+    """Share one in-flight execution between concurrent callers of a key
+
+    The first caller (the leader) runs the function inline, in its own
+    task and with its own resources; callers arriving while it runs
+    await the same result. Followers wait behind asyncio.shield, so a
+    cancelled follower never disturbs the others. If the leader is
+    cancelled, the waiting followers retry and one of them takes over.
+    Results are shared objects and must be treated as read-only.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._shared_by_key: Dict[Hashable, int] = {}
+        self.calls = 0
+        self.executions = 0
+        self.max_fan_in = 0
+        self._calls_metric = SINGLEFLIGHT_CALLS.labels(name)
+        self._executions_metric = SINGLEFLIGHT_EXECUTIONS.labels(name)
+        self._fan_in_metric = SINGLEFLIGHT_FAN_IN.labels(name)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        self._calls_metric.inc()
+        while True:
+            call = self._calls.get(key)
+            if call is None:
+                break
+            call.fan_in += 1
+            try:
+                return await asyncio.shield(call.future)
+            except _LeaderCancelled:
+                continue
+
+        call = self._calls[key] = _Call(asyncio.get_running_loop().create_future())
+        self.executions += 1
+        self._executions_metric.inc()
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            # Followers retry on their own, so nothing was shared
+            call.fan_in = 1
+            call.future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            call.future.set_exception(e)
+            raise
+        else:
+            call.future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+            self._record(key, call.fan_in)
+            if call.future.done():
+                # Followers may all be gone; mark any exception as retrieved
+                call.future.exception()
+
+    def _record(self, key: Hashable, fan_in: int) -> None:
+        self._fan_in_metric.observe(fan_in)
+        self.max_fan_in = max(self.max_fan_in, fan_in)
+        if fan_in > 1:
+            self._shared_by_key[key] = self._shared_by_key.get(key, 0) + fan_in - 1
+            if len(self._shared_by_key) > _MAX_TRACKED_KEYS:
+                hottest = sorted(self._shared_by_key.items(), key=lambda item: item[1], reverse=True)
+                self._shared_by_key = dict(hottest[:_KEPT_KEYS])
+
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        hottest = sorted(self._shared_by_key.items(), key=lambda item: item[1], reverse=True)
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "saved": self.calls - self.executions,
+            "in_flight": len(self._calls),
+            "max_fan_in": self.max_fan_in,
+            "top_keys": [[repr(key), saved] for key, saved in hottest[:top]],
+        }
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def singleflight(
+    name: Optional[str] = None,
+    exclude: Iterable[str] = ("db",),
+    session: Optional[str] = "db",
+) -> Callable:
+    """Coalesce concurrent calls of an async function with equal arguments
+
+    The key is built from every argument except those named in exclude,
+    which by default skips the caller's own database session. The engine
+    that session reads from still goes into the key, so a caller pinned
+    to the primary after a write never receives a replica's result.
+    """
+    excluded = frozenset(exclude)
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        group_name = name or f"{func.__module__}.{func.__qualname__}"
+        group = _groups.setdefault(group_name, SingleFlight(group_name))
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(
+                (param, value) for param, value in bound.arguments.items() if param not in excluded
+            )
+            if session is not None and bound.arguments.get(session) is not None:
+                key += (("bind", bound.arguments[session].get_bind()),)
+            return await group.do(key, lambda: func(*args, **kwargs))
+
+        wrapper.singleflight = group
+        return wrapper
+
+    return decorator
+
+
+def singleflight_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: group.stats() for name, group in _groups.items()}
@@ -22,15 +22,104 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = config.get("DB_PASSWORD")
     POSTGRES_DB: str = config.get("DB_DATABASE")
     SQLALCHEMY_DATABASE_URI: Optional[str] = None
+    DB_POOL_SIZE: int = config.get("DB_POOL_SIZE")
+    DB_POOL_MIN_SIZE: int = config.get("DB_POOL_MIN_SIZE")
+    DB_MAX_OVERFLOW: int = config.get("DB_MAX_OVERFLOW")
+    DB_POOL_RECYCLE: int = config.get("DB_POOL_RECYCLE")
+    DB_POOL_TIMEOUT: float = config.get("DB_POOL_TIMEOUT")
+    DB_POOL_PRE_PING: bool = config.get("DB_POOL_PRE_PING")
+    DB_STATEMENT_CACHE_SIZE: int = config.get("DB_STATEMENT_CACHE_SIZE")
+
+    # Read replica
+    DB_READ_HOST: Optional[str] = config.get("DB_READ_HOST")
+    DB_READ_PORT: int = config.get("DB_READ_PORT")
+    DB_READ_YOUR_WRITES_WINDOW: float = config.get("DB_READ_YOUR_WRITES_WINDOW")
+    DB_READ_RETRY_INTERVAL: float = config.get("DB_READ_RETRY_INTERVAL")
+    SQLALCHEMY_READ_DATABASE_URI: Optional[str] = None
 
     # JWT
     SECRET_KEY: str = config.get("JWT_SECRET")
     ALGORITHM: str = config.get("JWT_ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = config.get("JWT_ACCESS_TOKEN_EXPIRE_MINUTES")
+    JWT_KEY_ID: str = config.get("JWT_KEY_ID")
+    JWT_PREVIOUS_SECRETS: str = config.get("JWT_PREVIOUS_SECRETS")
+    TOKEN_CACHE_SIZE: int = config.get("JWT_TOKEN_CACHE_SIZE")
+    REVOCATION_DRIVER: str = config.get("REVOCATION_DRIVER")
+    REVOCATION_REFRESH_INTERVAL: float = config.get("REVOCATION_REFRESH_INTERVAL")
+
+    # Password hashing
+    HASH_EXECUTOR: str = config.get("HASH_EXECUTOR")
+    HASH_MAX_WORKERS: int = config.get("HASH_MAX_WORKERS")
+    HASH_MAX_PENDING: int = config.get("HASH_MAX_PENDING")
+
+    # Principal cache
+    PRINCIPAL_CACHE_SIZE: int = config.get("PRINCIPAL_CACHE_SIZE")
+    PRINCIPAL_CACHE_TTL: int = config.get("PRINCIPAL_CACHE_TTL")
+
+    # Rate limiting
+    RATE_LIMIT_DRIVER: str = config.get("RATE_LIMIT_DRIVER")
+    RATE_LIMIT_MAX_KEYS: int = config.get("RATE_LIMIT_MAX_KEYS")
+    RATE_LIMIT_LOGIN: str = config.get("RATE_LIMIT_LOGIN")
+    RATE_LIMIT_LOGIN_IP: str = config.get("RATE_LIMIT_LOGIN_IP")
+    RATE_LIMIT_REGISTER: str = config.get("RATE_LIMIT_REGISTER")
+
+    # Response compression
+    COMPRESSION_ENCODINGS: str = config.get("COMPRESSION_ENCODINGS")
+    COMPRESSION_MIN_SIZE: int = config.get("COMPRESSION_MIN_SIZE")
+    COMPRESSION_ROUTE_LEVELS: str = config.get("COMPRESSION_ROUTE_LEVELS")
+    COMPRESSION_OFFLOAD_SIZE: int = config.get("COMPRESSION_OFFLOAD_SIZE")
+
+    # Search
+    SEARCH_DRIVER: str = config.get("SEARCH_DRIVER")
+
+    # Mail
+    MAIL_MAILER: str = config.get("MAIL_MAILER")
+    MAIL_HOST: str = config.get("MAIL_HOST")
+    MAIL_PORT: int = config.get("MAIL_PORT")
+    MAIL_USERNAME: Optional[str] = config.get("MAIL_USERNAME")
+    MAIL_PASSWORD: Optional[str] = config.get("MAIL_PASSWORD")
+    MAIL_ENCRYPTION: Optional[str] = config.get("MAIL_ENCRYPTION")
+    MAIL_FROM_ADDRESS: Optional[str] = config.get("MAIL_FROM_ADDRESS")
+    MAIL_FROM_NAME: str = config.get("MAIL_FROM_NAME")
+    MAIL_TIMEOUT: float = config.get("MAIL_TIMEOUT")
+    MAIL_POOL_SIZE: int = config.get("MAIL_POOL_SIZE")
+    MAIL_WORKERS: int = config.get("MAIL_WORKERS")
+    MAIL_BATCH_SIZE: int = config.get("MAIL_BATCH_SIZE")
+    MAIL_MAX_ATTEMPTS: int = config.get("MAIL_MAX_ATTEMPTS")
+    MAIL_RETRY_BACKOFF: float = config.get("MAIL_RETRY_BACKOFF")
+    MAIL_POLL_INTERVAL: float = config.get("MAIL_POLL_INTERVAL")
+
+    # Redis
+    REDIS_HOST: str = config.get("REDIS_HOST")
+    REDIS_PORT: int = config.get("REDIS_PORT")
+    REDIS_PASSWORD: Optional[str] = config.get("REDIS_PASSWORD")
+
+    # Cache
+    CACHE_DRIVER: str = config.get("CACHE_DRIVER")
+    CACHE_PREFIX: str = config.get("CACHE_PREFIX")
+    CACHE_PATH: str = config.get("CACHE_PATH")
+    CACHE_MAX_ENTRIES: int = config.get("CACHE_MAX_ENTRIES")
+
+    # Session
+    SESSION_DRIVER: str = config.get("SESSION_DRIVER")
+    SESSION_LIFETIME: int = config.get("SESSION_LIFETIME")
+    SESSION_PATH: str = config.get("SESSION_PATH")
+    SESSION_COOKIE: str = config.get("SESSION_COOKIE")
+    SESSION_SECURE_COOKIE: bool = config.get("SESSION_SECURE_COOKIE")
 
     # Server
     HOST: str = config.get("SERVER_HOST")
     PORT: int = config.get("SERVER_PORT")
+    SHUTDOWN_GRACE_PERIOD: float = config.get("SHUTDOWN_GRACE_PERIOD")
+
+    # Access log
+    ACCESS_LOG_SAMPLE_RATE: float = config.get("ACCESS_LOG_SAMPLE_RATE")
+    ACCESS_LOG_ROUTE_SAMPLE_RATES: str = config.get("ACCESS_LOG_ROUTE_SAMPLE_RATES")
+
+    # Metrics
+    METRICS_DIR: str = config.get("METRICS_DIR")
+    METRICS_FLUSH_INTERVAL: float = config.get("METRICS_FLUSH_INTERVAL")
+    METRICS_TOKEN: str = config.get("METRICS_TOKEN")
 
     # Debug
     DEBUG: bool = config.get("APP_DEBUG")
@@ -47,6 +136,11 @@ class Settings(BaseSettings):
                 f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
                 f"@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
             )
+        if not self.SQLALCHEMY_READ_DATABASE_URI and self.DB_READ_HOST:
+            self.SQLALCHEMY_READ_DATABASE_URI = (
+                f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+                f"@{self.DB_READ_HOST}:{self.DB_READ_PORT}/{self.POSTGRES_DB}"
+            )
 
 
 @lru_cache()
@@ -37,6 +37,7 @@ class ConfigManager:
             # Server
             "SERVER_HOST": os.getenv("SERVER_HOST", "0.0.0.0"),
             "SERVER_PORT": int(os.getenv("SERVER_PORT", "8000")),
+            "SHUTDOWN_GRACE_PERIOD": float(os.getenv("SHUTDOWN_GRACE_PERIOD", "10")),
 
             # Database
             "DB_CONNECTION": os.getenv("DB_CONNECTION", "postgresql"),
@@ -45,11 +46,54 @@ class ConfigManager:
             "DB_DATABASE": os.getenv("DB_DATABASE", "llama_fastapi"),
             "DB_USERNAME": os.getenv("DB_USERNAME", "postgres"),
             "DB_PASSWORD": os.getenv("DB_PASSWORD", "postgres"),
+            "DB_POOL_SIZE": int(os.getenv("DB_POOL_SIZE", "5")),
+            "DB_POOL_MIN_SIZE": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "DB_MAX_OVERFLOW": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            "DB_POOL_RECYCLE": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+            "DB_POOL_TIMEOUT": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+            "DB_POOL_PRE_PING": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+            "DB_STATEMENT_CACHE_SIZE": int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100")),
+
+            # Read replica
+            "DB_READ_HOST": os.getenv("DB_READ_HOST"),
+            "DB_READ_PORT": int(os.getenv("DB_READ_PORT", os.getenv("DB_PORT", "5432"))),
+            "DB_READ_YOUR_WRITES_WINDOW": float(os.getenv("DB_READ_YOUR_WRITES_WINDOW", "5")),
+            "DB_READ_RETRY_INTERVAL": float(os.getenv("DB_READ_RETRY_INTERVAL", "5")),
 
             # JWT
             "JWT_SECRET": os.getenv("JWT_SECRET", "your-jwt-secret-key-here"),
             "JWT_ALGORITHM": os.getenv("JWT_ALGORITHM", "HS256"),
             "JWT_ACCESS_TOKEN_EXPIRE_MINUTES": int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30")),
+            "JWT_KEY_ID": os.getenv("JWT_KEY_ID", "default"),
+            "JWT_PREVIOUS_SECRETS": os.getenv("JWT_PREVIOUS_SECRETS", ""),
+            "JWT_TOKEN_CACHE_SIZE": int(os.getenv("JWT_TOKEN_CACHE_SIZE", "10000")),
+            "REVOCATION_DRIVER": os.getenv("REVOCATION_DRIVER", "database"),
+            "REVOCATION_REFRESH_INTERVAL": float(os.getenv("REVOCATION_REFRESH_INTERVAL", "5")),
+
+            # Password hashing
+            "HASH_EXECUTOR": os.getenv("HASH_EXECUTOR", "thread"),
+            "HASH_MAX_WORKERS": int(os.getenv("HASH_MAX_WORKERS", "4")),
+            "HASH_MAX_PENDING": int(os.getenv("HASH_MAX_PENDING", "64")),
+
+            # Principal cache
+            "PRINCIPAL_CACHE_SIZE": int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000")),
+            "PRINCIPAL_CACHE_TTL": int(os.getenv("PRINCIPAL_CACHE_TTL", "60")),
+
+            # Rate limiting
+            "RATE_LIMIT_DRIVER": os.getenv("RATE_LIMIT_DRIVER", "memory"),
+            "RATE_LIMIT_MAX_KEYS": int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000")),
+            "RATE_LIMIT_LOGIN": os.getenv("RATE_LIMIT_LOGIN", "5/minute"),
+            "RATE_LIMIT_LOGIN_IP": os.getenv("RATE_LIMIT_LOGIN_IP", "30/minute"),
+            "RATE_LIMIT_REGISTER": os.getenv("RATE_LIMIT_REGISTER", "10/hour"),
+
+            # Response compression
+            "COMPRESSION_ENCODINGS": os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip"),
+            "COMPRESSION_MIN_SIZE": int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+            "COMPRESSION_ROUTE_LEVELS": os.getenv("COMPRESSION_ROUTE_LEVELS", "/v1/articles/export=1,/v1/users/export=1"),
+            "COMPRESSION_OFFLOAD_SIZE": int(os.getenv("COMPRESSION_OFFLOAD_SIZE", "262144")),
+
+            # Search
+            "SEARCH_DRIVER": os.getenv("SEARCH_DRIVER", "auto"),
 
             # Mail
             "MAIL_MAILER": os.getenv("MAIL_MAILER", "smtp"),
@@ -60,6 +104,13 @@ class ConfigManager:
             "MAIL_ENCRYPTION": os.getenv("MAIL_ENCRYPTION"),
             "MAIL_FROM_ADDRESS": os.getenv("MAIL_FROM_ADDRESS"),
             "MAIL_FROM_NAME": os.getenv("MAIL_FROM_NAME", "Llama FastAPI"),
+            "MAIL_TIMEOUT": float(os.getenv("MAIL_TIMEOUT", "10")),
+            "MAIL_POOL_SIZE": int(os.getenv("MAIL_POOL_SIZE", "2")),
+            "MAIL_WORKERS": int(os.getenv("MAIL_WORKERS", "2")),
+            "MAIL_BATCH_SIZE": int(os.getenv("MAIL_BATCH_SIZE", "20")),
+            "MAIL_MAX_ATTEMPTS": int(os.getenv("MAIL_MAX_ATTEMPTS", "5")),
+            "MAIL_RETRY_BACKOFF": float(os.getenv("MAIL_RETRY_BACKOFF", "30")),
+            "MAIL_POLL_INTERVAL": float(os.getenv("MAIL_POLL_INTERVAL", "2")),
 
             # Redis
             "REDIS_HOST": os.getenv("REDIS_HOST", "127.0.0.1"),
@@ -69,14 +120,26 @@ class ConfigManager:
             # Cache
             "CACHE_DRIVER": os.getenv("CACHE_DRIVER", "file"),
             "CACHE_PREFIX": os.getenv("CACHE_PREFIX", "llama_cache"),
+            "CACHE_PATH": os.getenv("CACHE_PATH", "storage/cache"),
+            "CACHE_MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", "10000")),
 
             # Session
             "SESSION_DRIVER": os.getenv("SESSION_DRIVER", "file"),
             "SESSION_LIFETIME": int(os.getenv("SESSION_LIFETIME", "120")),
+            "SESSION_PATH": os.getenv("SESSION_PATH", "storage/sessions"),
+            "SESSION_COOKIE": os.getenv("SESSION_COOKIE", "llama_session"),
+            "SESSION_SECURE_COOKIE": os.getenv("SESSION_SECURE_COOKIE", "false").lower() == "true",
 
             # Logging
             "LOG_CHANNEL": os.getenv("LOG_CHANNEL", "stack"),
             "LOG_LEVEL": os.getenv("LOG_LEVEL", "debug"),
+            "ACCESS_LOG_SAMPLE_RATE": float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1.0")),
+            "ACCESS_LOG_ROUTE_SAMPLE_RATES": os.getenv("ACCESS_LOG_ROUTE_SAMPLE_RATES", ""),
+
+            # Metrics
+            "METRICS_DIR": os.getenv("METRICS_DIR", ""),
+            "METRICS_FLUSH_INTERVAL": float(os.getenv("METRICS_FLUSH_INTERVAL", "5")),
+            "METRICS_TOKEN": os.getenv("METRICS_TOKEN", ""),
         }
 
     def get(self, key: str, default: Any = None) -> Any:
@@ -1,9 +1,12 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy.ext.asyncio import AsyncSession
+from jose import JWTError
 from config.config import get_settings
-from database.session import get_db
+from config.principal_cache import Principal, get_principal_cache
+from config.security import decode_access_token
+from config.tokens import TOKEN_VERSION
+from database.session import get_sessionmaker
+from app.auth.revocation import get_revocation_service
 from app.user import services as user_services
 from app.auth.schemas import TokenData
 
@@ -11,40 +14,62 @@ settings = get_settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
-async def get_current_user(
-    db: AsyncSession = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-):
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_access_token(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
         token_data = TokenData(email=email)
     except JWTError:
         raise credentials_exception
-    
-    user = await user_services.get_user_by_email(db, email=token_data.email)
-    if user is None:
+    if get_revocation_service().revocations.is_revoked(payload):
         raise credentials_exception
-    return user
+
+    if payload.get("ver") == TOKEN_VERSION:
+        # Signed claims carry everything authorization needs
+        return Principal(
+            id=payload["uid"],
+            email=email,
+            is_active=payload["active"],
+            is_superuser=payload["su"],
+        )
+
+    # Tokens issued before the claims were added: look the user up
+    principal_cache = get_principal_cache()
+    principal = principal_cache.get(token_data.email)
+    if principal is not None:
+        return principal
+
+    async with get_sessionmaker()() as db:
+        principal = await user_services.get_principal_by_email(db, email=token_data.email)
+    if principal is None:
+        raise credentials_exception
+    principal_cache.set(token_data.email, principal)
+    return principal
 
 
 async def get_current_active_user(
-    current_user = Depends(get_current_user)
-):
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     if not current_user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
         )
-    return current_user 
\ No newline at end of file
+    return current_user 
+
+async def get_current_active_superuser(
+    current_user: Principal = Depends(get_current_active_user)
+) -> Principal:
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough privileges"
+        )
+    return current_user
@@ -0,0 +1,98 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from .config import settings
+
+
+class HashingPoolSaturated(Exception):
+    """Raised when the hashing pool has no free queue slot"""
+
+
+class HashingPool:
+    """Bounded executor that keeps bcrypt work off the event loop"""
+
+    def __init__(self, kind: str = "thread", max_workers: int = 4, max_pending: int = 64):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unsupported hashing executor: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="hashing",
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run func(*args) in the pool, rejecting when the queue is full"""
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise HashingPoolSaturated("Password hashing pool is saturated")
+
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        start = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._pending -= 1
+            self._completed += 1
+            self._latency_total += elapsed
+            if elapsed > self._latency_max:
+                self._latency_max = elapsed
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and latency counters"""
+        return {
+            "executor": self.kind,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "queue_depth": self._pending,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "latency_avg_ms": (
+                self._latency_total / self._completed * 1000 if self._completed else 0.0
+            ),
+            "latency_max_ms": self._latency_max * 1000,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+_pool: Optional[HashingPool] = None
+
+
+def get_hashing_pool() -> HashingPool:
+    """Get the process-wide hashing pool"""
+    global _pool
+    if _pool is None:
+        _pool = HashingPool(
+            kind=settings.HASH_EXECUTOR,
+            max_workers=settings.HASH_MAX_WORKERS,
+            max_pending=settings.HASH_MAX_PENDING,
+        )
+    return _pool
+
+
+def shutdown_hashing_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
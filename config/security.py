@@ -1,8 +1,11 @@
+import secrets
+import time
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import jwt
+from typing import Any, Optional
 from passlib.context import CryptContext
 from .config import settings
+from .hashing import get_hashing_pool
+from .tokens import TOKEN_VERSION, decode_token, encode_token
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -16,6 +19,16 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the hashing pool instead of on the event loop"""
+    return await get_hashing_pool().run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password in the hashing pool instead of on the event loop"""
+    return await get_hashing_pool().run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -23,7 +36,26 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
+    return encode_token(to_encode)
+
+
+def create_user_token(user: Any, expires_delta: Optional[timedelta] = None) -> str:
+    """Access token whose claims are enough to authorize without a DB lookup"""
+    return create_access_token(
+        data={
+            "sub": user.email,
+            "uid": user.id,
+            "active": bool(user.is_active),
+            "su": bool(user.is_superuser),
+            "ver": TOKEN_VERSION,
+            # Revocation: iat against per-user cutoffs, jti for single tokens
+            "iat": time.time(),
+            "jti": secrets.token_urlsafe(12),
+        },
+        expires_delta=expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
     )
-    return encoded_jwt 
\ No newline at end of file
+
+
+def decode_access_token(token: str) -> dict:
+    """Verified claims of an access token; raises JWTError when invalid"""
+    return decode_token(token) 
\ No newline at end of file
@@ -0,0 +1,133 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from jose import JWTError, jwt
+from .config import settings
+
+# Bump when the claim set changes; tokens of another version take the
+# database path in get_current_user instead of the claims fast path
+TOKEN_VERSION = 1
+
+
+def parse_previous_secrets(spec: Optional[str]) -> Dict[str, str]:
+    """Parse "kid1:secret1,kid2:secret2" into a kid -> secret map"""
+    keys: Dict[str, str] = {}
+    for item in (spec or "").split(","):
+        kid, sep, secret = item.strip().partition(":")
+        if sep and kid and secret:
+            keys[kid] = secret
+    return keys
+
+
+class KeyRing:
+    """Signing key plus retired keys still accepted for verification
+
+    Rotation: deploy the new JWT_SECRET/JWT_KEY_ID with the old pair in
+    JWT_PREVIOUS_SECRETS, then drop the old pair once its tokens expire.
+    Tokens without a kid header are checked against the current key.
+    """
+
+    def __init__(self, kid: str, secret: str, previous: Optional[Dict[str, str]] = None):
+        self.kid = kid
+        self._keys = {**(previous or {}), kid: secret}
+
+    @property
+    def signing_key(self) -> Tuple[str, str]:
+        return self.kid, self._keys[self.kid]
+
+    def verification_key(self, kid: Optional[str]) -> Optional[str]:
+        return self._keys.get(kid or self.kid)
+
+
+class VerifiedTokenCache:
+    """LRU of tokens whose signature and claims were already verified
+
+    A bearer token reused on a keep-alive connection then skips the
+    HMAC and JSON decoding. Entries expire together with the token.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            del self._entries[token]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return claims
+
+    def set(self, token: str, claims: Dict[str, Any]) -> None:
+        if self.maxsize <= 0 or "exp" not in claims:
+            return
+        self._entries[token] = (float(claims["exp"]), claims)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+_keyring: Optional[KeyRing] = None
+_token_cache: Optional[VerifiedTokenCache] = None
+
+
+def get_keyring() -> KeyRing:
+    global _keyring
+    if _keyring is None:
+        _keyring = KeyRing(
+            settings.JWT_KEY_ID,
+            settings.SECRET_KEY,
+            parse_previous_secrets(settings.JWT_PREVIOUS_SECRETS),
+        )
+    return _keyring
+
+
+def get_token_cache() -> VerifiedTokenCache:
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = VerifiedTokenCache(maxsize=settings.TOKEN_CACHE_SIZE)
+    return _token_cache
+
+
+def encode_token(claims: Dict[str, Any]) -> str:
+    kid, secret = get_keyring().signing_key
+    return jwt.encode(claims, secret, algorithm=settings.ALGORITHM, headers={"kid": kid})
+
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """Verified claims of token, served from the cache when seen before
+
+    Raises JWTError for a bad signature, unknown kid or expired token.
+    """
+    cache = get_token_cache()
+    claims = cache.get(token)
+    if claims is not None:
+        return claims
+    kid = jwt.get_unverified_header(token).get("kid")
+    secret = get_keyring().verification_key(kid)
+    if secret is None:
+        raise JWTError(f"Unknown signing key: {kid}")
+    claims = jwt.decode(token, secret, algorithms=[settings.ALGORITHM])
+    cache.set(token, claims)
+    return claims
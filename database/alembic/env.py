@@ -10,7 +10,11 @@ from alembic import context
 
 from database.base import Base
 from app.user.models import User  # Import all models here
+from app.article.models import Article
+from app.auth.models import TokenRevocation
+from mail.models import OutboxMessage
 from config.config import settings
+from database.migrations import migration_progress
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -25,6 +29,11 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep autogenerate away from tables the migration helpers manage"""
+    return not (type_ == "table" and name == migration_progress.name)
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -54,6 +63,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -62,6 +72,15 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def is_dry_run() -> bool:
+    """``alembic -x dry_run=true upgrade head``: report, then roll everything back
+
+    Only on backends with transactional DDL (Postgres); others refuse it.
+    """
+    value = context.get_x_argument(as_dictionary=True).get("dry_run", "")
+    return value.lower() in ("1", "true", "yes")
+
+
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
 
@@ -71,12 +90,33 @@ def run_migrations_online() -> None:
         poolclass=pool.NullPool,
     )
 
+    dry_run = is_dry_run()
     with connectable.connect() as connection:
         context.configure(
             connection=connection,
-            target_metadata=target_metadata
+            target_metadata=target_metadata,
+            include_object=include_object,
+            # Read by the database.migrations helpers
+            dry_run=dry_run,
         )
 
+        if dry_run:
+            # Helpers only log in dry runs; plain DDL and the version
+            # stamp are undone by rolling back, which only works where
+            # DDL is transactional. Elsewhere alembic commits each
+            # revision itself and the "dry run" would really migrate.
+            if not context.get_impl().transactional_ddl:
+                raise RuntimeError(
+                    f"dry_run needs transactional DDL, which {connection.dialect.name} does not have; "
+                    "preview the SQL with `alembic upgrade head --sql` instead"
+                )
+            transaction = connection.begin()
+            try:
+                context.run_migrations()
+            finally:
+                transaction.rollback()
+            return
+
         with context.begin_transaction():
             context.run_migrations()
 
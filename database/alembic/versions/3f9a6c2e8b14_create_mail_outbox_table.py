@@ -0,0 +1,43 @@
+"""Create mail_outbox table
+
+Revision ID: 3f9a6c2e8b14
+Revises: 8e4b2a7c1d35
+Create Date: 2026-10-18 16:40:12.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a6c2e8b14'
+down_revision: Union[str, None] = '8e4b2a7c1d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'mail_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('to_address', sa.String(length=255), nullable=False),
+        sa.Column('subject', sa.String(length=255), nullable=False),
+        sa.Column('body_text', sa.Text(), nullable=False),
+        sa.Column('body_html', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.Float(), nullable=False),
+        sa.Column('available_at', sa.Float(), nullable=False),
+        sa.Column('sent_at', sa.Float(), nullable=True),
+        sa.Column('claim_token', sa.String(length=32), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_mail_outbox_status_available_at', 'mail_outbox', ['status', 'available_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_mail_outbox_status_available_at', table_name='mail_outbox')
+    op.drop_table('mail_outbox')
@@ -0,0 +1,38 @@
+"""Create articles table
+
+Revision ID: 5c1d8e2f7a90
+Revises: a267cb3996ea
+Create Date: 2026-10-18 10:12:04.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1d8e2f7a90'
+down_revision: Union[str, None] = 'a267cb3996ea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'articles',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('author_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['author_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_articles_author_id'), 'articles', ['author_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_articles_author_id'), table_name='articles')
+    op.drop_table('articles')
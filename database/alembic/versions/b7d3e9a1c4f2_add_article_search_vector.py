@@ -0,0 +1,43 @@
+"""Add full-text search vector to articles
+
+Revision ID: b7d3e9a1c4f2
+Revises: 3f9a6c2e8b14
+Create Date: 2026-10-18 17:02:37.904115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e9a1c4f2'
+down_revision: Union[str, None] = '3f9a6c2e8b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Postgres only; other databases use the in-process search index
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # Generated, so every INSERT/UPDATE keeps it current; title ranks above content
+    op.execute(
+        """
+        ALTER TABLE articles ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(content, '')), 'B')
+        ) STORED
+        """
+    )
+    op.create_index(
+        'ix_articles_search_vector', 'articles', ['search_vector'], unique=False, postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_articles_search_vector', table_name='articles', postgresql_using='gin')
+    op.drop_column('articles', 'search_vector')
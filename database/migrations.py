@@ -0,0 +1,261 @@
+"""Online, low-lock helpers for Alembic revisions on large tables
+
+Plain op.create_index holds a SHARE lock that blocks writes for the
+whole build, and a single UPDATE backfill holds row locks on every row
+until it commits. These helpers avoid both:
+
+    from database.migrations import backfill, create_index_concurrently
+
+    def upgrade() -> None:
+        op.add_column('users', sa.Column('email_domain', sa.String(255), nullable=True))
+        users = sa.table('users', sa.column('id', sa.Integer), sa.column('email', sa.String),
+                         sa.column('email_domain', sa.String))
+        backfill(
+            'users_email_domain', users,
+            {'email_domain': sa.func.split_part(users.c.email, '@', 2)},
+            where=users.c.email_domain.is_(None),
+        )
+        create_index_concurrently('ix_users_email_domain', 'users', ['email_domain'])
+
+On Postgres both run outside the revision's transaction
+(autocommit_block), which commits everything before them: put them
+after the DDL they depend on and keep the revision re-runnable.
+Backfills commit one primary-key range at a time and record progress in
+the migration_progress table; after an interruption the next run
+resumes from the last committed range.
+
+Dry run: ``alembic -x dry_run=true upgrade head`` only reports what
+would be done, including the estimated number of rows each backfill
+touches, and rolls back everything else the revisions executed. It
+needs transactional DDL (Postgres): on SQLite or MySQL the rollback
+could not undo the revisions, so env.py refuses it; use
+``alembic upgrade head --sql`` there.
+"""
+import contextlib
+import logging
+import time
+from typing import Any, Dict, Optional, Sequence
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.expression import TableClause
+
+logger = logging.getLogger("alembic.migrations")
+
+_metadata = sa.MetaData()
+
+migration_progress = sa.Table(
+    "migration_progress",
+    _metadata,
+    sa.Column("name", sa.String(128), primary_key=True),
+    sa.Column("last_key", sa.BigInteger, nullable=False),
+    sa.Column("rows_done", sa.BigInteger, nullable=False),
+    sa.Column("finished", sa.Boolean, nullable=False),
+    sa.Column("updated_at", sa.Float, nullable=False),
+)
+
+
+def is_dry_run() -> bool:
+    """Whether env.py configured the run with ``-x dry_run=true``"""
+    return bool(op.get_context().opts.get("dry_run"))
+
+
+def _is_postgres(bind: Connection) -> bool:
+    return bind.dialect.name == "postgresql"
+
+
+def estimate_rows(bind: Connection, table: TableClause, where: Optional[ColumnElement] = None) -> int:
+    """Rows matching where, from the planner's estimate on Postgres
+
+    COUNT(*) over tens of millions of rows is itself a long scan, so
+    Postgres uses EXPLAIN; other databases count exactly.
+    """
+    stmt = sa.select(sa.literal(1)).select_from(table)
+    if where is not None:
+        stmt = stmt.where(where)
+    if _is_postgres(bind):
+        compiled = stmt.compile(bind, compile_kwargs={"literal_binds": True})
+        plan = bind.execute(sa.text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"])
+    return bind.execute(sa.select(sa.func.count()).select_from(stmt.subquery())).scalar()
+
+
+def _set_lock_timeout(bind: Connection, lock_timeout: Optional[str]) -> None:
+    # Fail fast instead of queueing behind a long transaction, since
+    # every other query on the table would then queue behind us
+    if lock_timeout and _is_postgres(bind):
+        bind.execute(sa.text(f"SET lock_timeout = '{lock_timeout}'"))
+
+
+def _invalid_index(bind: Connection, name: str) -> bool:
+    """A CONCURRENTLY build that failed leaves an INVALID index behind"""
+    return bool(bind.execute(
+        sa.text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": name},
+    ).first())
+
+
+def create_index_concurrently(
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    unique: bool = False,
+    where: Optional[str] = None,
+    lock_timeout: Optional[str] = "5s",
+) -> None:
+    """CREATE INDEX CONCURRENTLY outside the migration transaction
+
+    Writes continue during the build. Re-running after a failed build
+    drops the INVALID leftover first. Other databases get a plain index;
+    a partial (where) index is only supported on SQLite among them.
+    """
+    bind = op.get_bind()
+    if is_dry_run():
+        rows = estimate_rows(bind, sa.table(table))
+        logger.info(f"[dry run] would create index {name} on {table} ({', '.join(columns)}), ~{rows} rows")
+        return
+    if not _is_postgres(bind):
+        if where and bind.dialect.name != "sqlite":
+            raise NotImplementedError(f"Partial index {name} is not supported on {bind.dialect.name}")
+        op.create_index(
+            name, table, list(columns), unique=unique, sqlite_where=sa.text(where) if where else None
+        )
+        return
+    with op.get_context().autocommit_block():
+        # The block swaps in an autocommit connection
+        bind = op.get_bind()
+        _set_lock_timeout(bind, lock_timeout)
+        if _invalid_index(bind, name):
+            logger.warning(f"Dropping invalid index {name} left by a failed build")
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+        started = time.monotonic()
+        op.create_index(
+            name,
+            table,
+            list(columns),
+            unique=unique,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text(where) if where else None,
+            if_not_exists=True,
+        )
+        logger.info(f"Created index {name} on {table} in {time.monotonic() - started:.1f}s")
+        _set_lock_timeout(bind, "0")
+
+
+def drop_index_concurrently(name: str, table: str, lock_timeout: Optional[str] = "5s") -> None:
+    """DROP INDEX CONCURRENTLY outside the migration transaction"""
+    bind = op.get_bind()
+    if is_dry_run():
+        logger.info(f"[dry run] would drop index {name} on {table}")
+        return
+    if not _is_postgres(bind):
+        op.drop_index(name, table_name=table)
+        return
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        _set_lock_timeout(bind, lock_timeout)
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        _set_lock_timeout(bind, "0")
+
+
+def _load_progress(bind: Connection, name: str) -> Optional[Dict[str, Any]]:
+    migration_progress.create(bind, checkfirst=True)
+    row = bind.execute(
+        sa.select(migration_progress).where(migration_progress.c.name == name)
+    ).mappings().first()
+    return dict(row) if row is not None else None
+
+
+def _save_progress(bind: Connection, name: str, last_key: int, rows_done: int, finished: bool) -> None:
+    values = {"last_key": last_key, "rows_done": rows_done, "finished": finished, "updated_at": time.time()}
+    updated = bind.execute(
+        migration_progress.update().where(migration_progress.c.name == name).values(**values)
+    ).rowcount
+    if not updated:
+        bind.execute(migration_progress.insert().values(name=name, **values))
+
+
+def backfill(
+    name: str,
+    table: TableClause,
+    values: Dict[str, Any],
+    where: Optional[ColumnElement] = None,
+    key: str = "id",
+    batch_size: int = 10000,
+    pause: float = 0.1,
+    target_seconds: float = 1.0,
+    lock_timeout: Optional[str] = "5s",
+) -> int:
+    """UPDATE table SET values WHERE where, one committed key range at a time
+
+    name identifies the backfill in migration_progress; a finished
+    backfill is skipped and an interrupted one resumes after the last
+    committed range. Ranges adapt between batch_size / 16 and
+    batch_size * 16 keys so each UPDATE takes about target_seconds,
+    and pause seconds between ranges leave room for other writers and
+    for replicas to catch up. Returns the number of rows updated.
+    """
+    bind = op.get_bind()
+    pk = table.c[key]
+    bounds = bind.execute(sa.select(sa.func.min(pk), sa.func.max(pk)).select_from(table)).first()
+    low, high = bounds if bounds is not None else (None, None)
+
+    if is_dry_run():
+        rows = estimate_rows(bind, table, where)
+        ranges = 0 if low is None else (high - low) // batch_size + 1
+        logger.info(
+            f"[dry run] backfill {name} would update ~{rows} rows of {table.name} "
+            f"in ~{ranges} ranges of {batch_size} keys"
+        )
+        return 0
+    if low is None:
+        return 0
+
+    # On Postgres every statement below commits on its own; elsewhere the
+    # ranges run inside the revision's transaction
+    block = op.get_context().autocommit_block() if _is_postgres(bind) else contextlib.nullcontext()
+    with block:
+        bind = op.get_bind()
+        progress = _load_progress(bind, name)
+        if progress is not None and progress["finished"]:
+            logger.info(f"Backfill {name} already finished ({progress['rows_done']} rows)")
+            return 0
+        start = progress["last_key"] + 1 if progress is not None else low
+        done = progress["rows_done"] if progress is not None else 0
+        if progress is not None:
+            logger.info(f"Resuming backfill {name} at {key}={start} ({done} rows done)")
+
+        _set_lock_timeout(bind, lock_timeout)
+        size = batch_size
+        started = time.monotonic()
+        while start <= high:
+            end = start + size
+            stmt = table.update().where(pk >= start, pk < end).values(**values)
+            if where is not None:
+                stmt = stmt.where(where)
+            chunk_started = time.monotonic()
+            # A crash between the UPDATE and the progress row only repeats
+            # that range on resume
+            done += bind.execute(stmt).rowcount
+            _save_progress(bind, name, end - 1, done, finished=end > high)
+            elapsed = time.monotonic() - chunk_started
+
+            percent = min(100.0, (end - low) / (high - low + 1) * 100)
+            rate = done / max(time.monotonic() - started, 1e-9)
+            logger.info(f"Backfill {name}: {key} < {end}, {percent:.1f}%, {done} rows, {rate:.0f} rows/s")
+
+            # Keep each range's lock time near target_seconds
+            if elapsed < target_seconds / 2:
+                size = min(size * 2, batch_size * 16)
+            elif elapsed > target_seconds * 2:
+                size = max(size // 2, max(1, batch_size // 16))
+            start = end
+            if pause and start <= high:
+                time.sleep(pause)
+        _save_progress(bind, name, high, done, finished=True)
+        _set_lock_timeout(bind, "0")
+    return done
@@ -0,0 +1,87 @@
+import logging
+import time
+from typing import Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# Prune the write log once it tracks this many clients
+_MAX_TRACKED_CLIENTS = 10000
+
+
+class ReplicaRouter:
+    """Decides whether a read may go to the replica
+
+    Reads stay on the primary when no replica is configured, while the
+    replica is marked unhealthy, or for a short read-your-writes window
+    after the same client committed a write.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[sessionmaker],
+        ryw_window: float = 5.0,
+        retry_interval: float = 5.0,
+    ):
+        self.session_factory = session_factory
+        self.ryw_window = ryw_window
+        self.retry_interval = retry_interval
+        self.healthy = True
+        self._unhealthy_until = 0.0
+        self._last_write: Dict[int, float] = {}
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.fallbacks = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.session_factory is not None
+
+    def record_write(self, client_key: int) -> None:
+        now = time.monotonic()
+        if len(self._last_write) >= _MAX_TRACKED_CLIENTS:
+            cutoff = now - self.ryw_window
+            self._last_write = {k: t for k, t in self._last_write.items() if t > cutoff}
+        self._last_write[client_key] = now
+
+    def recently_wrote(self, client_key: int) -> bool:
+        wrote_at = self._last_write.get(client_key)
+        return wrote_at is not None and time.monotonic() - wrote_at < self.ryw_window
+
+    def mark_unhealthy(self) -> None:
+        if self.healthy:
+            logger.warning("Read replica unavailable, routing reads to primary")
+        self.healthy = False
+        self._unhealthy_until = time.monotonic() + self.retry_interval
+
+    def should_use_replica(self, client_key: int) -> bool:
+        if not self.enabled or self.recently_wrote(client_key):
+            return False
+        # An unhealthy replica is retried once its back-off has elapsed
+        return self.healthy or time.monotonic() >= self._unhealthy_until
+
+    async def open_session(self) -> Optional[AsyncSession]:
+        """Open a replica session with a live connection, None on failure"""
+        session = self.session_factory()
+        try:
+            await session.connection()
+        except Exception:
+            await session.close()
+            self.mark_unhealthy()
+            self.fallbacks += 1
+            return None
+        if not self.healthy:
+            logger.info("Read replica recovered")
+            self.healthy = True
+        return session
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "enabled": self.enabled,
+            "healthy": self.healthy,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "fallbacks": self.fallbacks,
+            "tracked_clients": len(self._last_write),
+        }
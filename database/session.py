@@ -1,27 +1,204 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from typing import Any, Dict, Optional
+from fastapi import Request
+from jose import JWTError
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 from config.config import settings
+from config.security import decode_access_token
+from database.pool import InstrumentedQueuePool
+from database.replica import ReplicaRouter
 
-# Create async engine
-engine = create_async_engine(
-    settings.SQLALCHEMY_DATABASE_URI,
-    pool_pre_ping=True,
-    echo=settings.DEBUG,
-)
 
-# Create async session factory
-SessionLocal = sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
+def engine_options(url: str) -> Dict[str, Any]:
+    """Engine keyword arguments for url built from the DB_POOL_* settings"""
+    options: Dict[str, Any] = {
+        "echo": settings.DEBUG,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # In-memory SQLite needs its single shared connection
+        return options
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    if parsed.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+class PrimarySession(Session):
+    """Sync session class behind primary AsyncSessions
+
+    Commits that carried writes are reported to the replica router so
+    the same client keeps reading from the primary for a short window.
+    """
+
+
+# Engines and session factories are built on first use (normally in the
+# startup handler) so importing this module stays cheap and opens nothing
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[sessionmaker] = None
+_read_engine: Optional[AsyncEngine] = None
+_read_session_factory: Optional[sessionmaker] = None
+
+replica_router = ReplicaRouter(
+    None,
+    ryw_window=settings.DB_READ_YOUR_WRITES_WINDOW,
+    retry_interval=settings.DB_READ_RETRY_INTERVAL,
 )
 
-async def get_db():
+
+def init_engines() -> None:
+    """Create the primary and optional replica engines if not created yet"""
+    global _engine, _session_factory, _read_engine, _read_session_factory
+    if _engine is not None:
+        return
+    _engine = create_async_engine(
+        settings.SQLALCHEMY_DATABASE_URI,
+        **engine_options(settings.SQLALCHEMY_DATABASE_URI),
+    )
+    _session_factory = sessionmaker(
+        _engine,
+        class_=AsyncSession,
+        sync_session_class=PrimarySession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+    if settings.SQLALCHEMY_READ_DATABASE_URI:
+        _read_engine = create_async_engine(
+            settings.SQLALCHEMY_READ_DATABASE_URI,
+            **engine_options(settings.SQLALCHEMY_READ_DATABASE_URI),
+        )
+        _read_session_factory = sessionmaker(
+            _read_engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False,
+        )
+        replica_router.session_factory = _read_session_factory
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection of the primary and replica engines"""
+    if _engine is not None:
+        await _engine.dispose()
+    if _read_engine is not None:
+        await _read_engine.dispose()
+
+
+def get_engine() -> AsyncEngine:
+    init_engines()
+    return _engine
+
+
+def get_read_engine() -> Optional[AsyncEngine]:
+    """Replica engine, or None when no replica is configured"""
+    init_engines()
+    return _read_engine
+
+
+def get_sessionmaker() -> sessionmaker:
+    """Factory for primary AsyncSessions"""
+    init_engines()
+    return _session_factory
+
+
+def get_read_sessionmaker() -> Optional[sessionmaker]:
+    """Factory for replica AsyncSessions, or None without a replica"""
+    init_engines()
+    return _read_session_factory
+
+
+_LAZY_ATTRIBUTES = {
+    "engine": get_engine,
+    "read_engine": get_read_engine,
+    "SessionLocal": get_sessionmaker,
+    "ReadSessionLocal": get_read_sessionmaker,
+}
+
+
+def __getattr__(name: str) -> Any:
+    # Keep `from database.session import engine, SessionLocal` working
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _mark_flush_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _mark_statement_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _record_client_write(session):
+    if session.info.pop("wrote", False) and "client_key" in session.info:
+        replica_router.record_write(session.info["client_key"])
+
+
+def client_key_for(subject: str) -> int:
+    """Read-your-writes key of the user a token's subject names"""
+    return hash(f"user:{subject}")
+
+
+def _client_key(request: Request) -> int:
+    """Identify the caller by verified token subject, falling back to the client address
+
+    The subject stays the same across logins, so a new token still sees
+    the user's own writes. Remaining gaps: anonymous writes are keyed by
+    address, so a caller's later authenticated reads miss them (register
+    bridges this by recording its write for the new user), and callers
+    sharing an address share one anonymous key.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            subject = decode_access_token(token).get("sub")
+        except JWTError:
+            subject = None
+        if subject:
+            return client_key_for(subject)
+    return hash(request.client.host if request.client else "")
+
+
+async def get_db(request: Request):
     """获取数据库会话"""
-    async with SessionLocal() as session:
+    async with get_sessionmaker()() as session:
+        session.info["client_key"] = _client_key(request)
         try:
             yield session
         finally:
-            await session.close() 
\ No newline at end of file
+            await session.close()
+
+
+async def get_read_db(request: Request):
+    """获取只读数据库会话 (replica when available, primary otherwise)"""
+    client_key = _client_key(request)
+    session = None
+    if replica_router.should_use_replica(client_key):
+        session = await replica_router.open_session()
+    if session is None:
+        replica_router.primary_reads += 1
+        session = get_sessionmaker()()
+        session.info["client_key"] = client_key
+    else:
+        replica_router.replica_reads += 1
+    async with session:
+        yield session
@@ -0,0 +1,55 @@
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.sql import Executable
+
+logger = logging.getLogger(__name__)
+
+_hot_statements: List[Tuple[Executable, Optional[Dict[str, Any]]]] = []
+
+
+def register_hot_statement(stmt: Executable, params: Optional[Dict[str, Any]] = None) -> Executable:
+    """Run stmt on every warmed connection at startup
+
+    params (or the bind parameter defaults) should match no rows.
+    Executing the statement fills SQLAlchemy's compiled cache and, with
+    asyncpg, the connection's prepared statement cache before the first
+    request.
+    """
+    _hot_statements.append((stmt, params))
+    return stmt
+
+
+async def _prepare(conn: AsyncConnection) -> None:
+    await conn.execute(text("SELECT 1"))
+    for stmt, params in _hot_statements:
+        try:
+            await conn.execute(stmt, params)
+        except DBAPIError as e:
+            # e.g. migrations not applied yet; the connection is still warm
+            logger.warning(f"Skipped preparing hot statement: {e.orig}")
+        await conn.rollback()
+
+
+async def warm_pool(engine: AsyncEngine, min_size: int) -> int:
+    """Open min_size pooled connections at once and prepare hot statements
+
+    All connections are checked out together so the pool really holds
+    min_size distinct connections afterwards. Returns how many were warmed.
+    """
+    pool_size = getattr(engine.pool, "size", None)
+    size = max(1, min(min_size, pool_size()) if callable(pool_size) else 1)
+    async with AsyncExitStack() as stack:
+        results = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(size)),
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            raise errors[0]
+        await asyncio.gather(*(_prepare(conn) for conn in results))
+    return size
@@ -1,24 +1,126 @@
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from fastapi import FastAPI
-from typing import Callable
-from sqlalchemy import text
-from database.session import SessionLocal
-
-def create_start_app_handler(app: FastAPI) -> Callable:
-    async def start_app() -> None:
-        # Initialize database connection
-        try:
-            db = SessionLocal()
-            await db.execute(text("SELECT 1"))
-        except Exception as e:
-            print(f"Database connection failed: {e}")
-        finally:
-            await db.close()
-
-    return start_app
-
-def create_stop_app_handler(app: FastAPI) -> Callable:
-    async def stop_app() -> None:
-        # Clean up resources
-        pass
-
-    return stop_app
+from cache import close_cache, get_cache
+from config.config import settings
+from config.hashing import get_hashing_pool, shutdown_hashing_pool
+from app.article.search import close_search_engine, get_search_engine
+from app.auth.revocation import close_revocation_service, get_revocation_service
+from database.session import dispose_engines, get_engine, get_read_engine, init_engines
+from database.warmup import warm_pool
+from mail import close_mail_dispatcher, get_mail_dispatcher, mail_configured
+from metrics import start_metrics_flusher, stop_metrics_flusher
+from metrics.collectors import init_route_metrics, instrument_engine
+from middlewares.logging import start_access_log, stop_access_log
+from ratelimit import close_rate_limiter, get_rate_limiter
+from sessions import close_session_store, get_session_store
+from .registry import ResourceRegistry
+from .timing import startup_phase
+
+logger = logging.getLogger(__name__)
+
+
+async def _warm_database(app: FastAPI) -> None:
+    try:
+        warmed = await warm_pool(get_engine(), settings.DB_POOL_MIN_SIZE)
+        logger.info(f"Warmed {warmed} database connection(s)")
+    except Exception as e:
+        # Keep booting; requests will retry the connection themselves
+        logger.error(f"Database connection failed: {e}")
+
+
+async def _start_search(app: FastAPI) -> None:
+    try:
+        await get_search_engine().start()
+    except Exception as e:
+        # Keep booting; search answers from whatever was indexed
+        logger.error(f"Search index build failed: {e}")
+
+
+def _start_mail(app: FastAPI) -> None:
+    if not mail_configured():
+        # Queued mail stays in the outbox until a mailer is configured
+        logger.warning("Mail is not configured; the outbox dispatcher is not started")
+        return
+    get_mail_dispatcher().start()
+
+
+def _start_metrics(app: FastAPI) -> None:
+    instrument_engine(get_engine(), "primary")
+    if get_read_engine() is not None:
+        instrument_engine(get_read_engine(), "replica")
+    init_route_metrics(app)
+    start_metrics_flusher()
+
+
+async def _drain_requests(app: FastAPI) -> None:
+    tracker = getattr(app.state, "in_flight", None)
+    if tracker is None:
+        return
+    if not await tracker.drain(settings.SHUTDOWN_GRACE_PERIOD):
+        logger.warning(
+            f"{tracker.in_flight} request(s) still running after "
+            f"{settings.SHUTDOWN_GRACE_PERIOD}s grace period"
+        )
+
+
+def create_resource_registry() -> ResourceRegistry:
+    """Resources owned by the application lifespan
+
+    Stop hooks run in reverse, so in-flight requests are drained first
+    and the access log listener is flushed last.
+    """
+    registry = ResourceRegistry()
+    registry.register("access_log", start=lambda app: start_access_log(), stop=lambda app: stop_access_log())
+    registry.register("hashing", start=lambda app: get_hashing_pool(), stop=lambda app: shutdown_hashing_pool())
+    registry.register("cache", start=lambda app: get_cache(), stop=lambda app: close_cache())
+    registry.register("rate_limiter", start=lambda app: get_rate_limiter(), stop=lambda app: close_rate_limiter())
+    registry.register(
+        "sessions", start=lambda app: get_session_store().start(), stop=lambda app: close_session_store()
+    )
+    registry.register("engines", start=lambda app: init_engines(), stop=lambda app: dispose_engines())
+    registry.register("database", start=_warm_database, requires=("engines",))
+    registry.register(
+        "revocations",
+        start=lambda app: get_revocation_service().start(),
+        stop=lambda app: close_revocation_service(),
+        requires=("engines",),
+    )
+    registry.register(
+        "search", start=_start_search, stop=lambda app: close_search_engine(), requires=("engines",)
+    )
+    # Stops after draining, so mail queued by the last requests is picked up
+    registry.register(
+        "mail",
+        start=_start_mail,
+        stop=lambda app: close_mail_dispatcher(settings.SHUTDOWN_GRACE_PERIOD),
+        requires=("engines",),
+    )
+    # Stops before the hashing pool so the final shard still sees its counters
+    registry.register(
+        "metrics",
+        start=_start_metrics,
+        stop=lambda app: stop_metrics_flusher(),
+        requires=("engines", "hashing"),
+    )
+    registry.register(
+        "drain",
+        stop=_drain_requests,
+        requires=(
+            "access_log", "hashing", "cache", "rate_limiter", "sessions",
+            "database", "revocations", "mail", "metrics",
+        ),
+    )
+    return registry
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start every registered resource, serve, then stop them in reverse"""
+    registry = app.state.resources = create_resource_registry()
+    async with registry.run(app):
+        timings = app.state.startup_timings
+        phases = ", ".join(f"{name}={ms}ms" for name, ms in timings.items())
+        logger.info(f"Startup finished in {sum(timings.values()):.1f} ms ({phases})")
+        yield
@@ -0,0 +1,104 @@
+import inspect
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+from fastapi import FastAPI
+from .timing import startup_phase
+
+logger = logging.getLogger(__name__)
+
+Hook = Callable[[FastAPI], object]
+
+
+@dataclass
+class Resource:
+    name: str
+    start: Optional[Hook] = None
+    stop: Optional[Hook] = None
+    requires: Tuple[str, ...] = ()
+
+
+async def _call(hook: Hook, app: FastAPI) -> None:
+    result = hook(app)
+    if inspect.isawaitable(result):
+        await result
+
+
+class ResourceRegistry:
+    """Starts application resources in dependency order and stops them in reverse
+
+    Resources without a dependency between them start in registration
+    order. If a start hook fails, everything already started is stopped
+    before the error propagates. Stop hooks never prevent the remaining
+    resources from stopping.
+    """
+
+    def __init__(self):
+        self._resources: Dict[str, Resource] = {}
+        self._started: List[Resource] = []
+
+    def register(
+        self,
+        name: str,
+        start: Optional[Hook] = None,
+        stop: Optional[Hook] = None,
+        requires: Tuple[str, ...] = (),
+    ) -> None:
+        if name in self._resources:
+            raise ValueError(f"Resource already registered: {name}")
+        self._resources[name] = Resource(name, start, stop, tuple(requires))
+
+    def order(self) -> List[Resource]:
+        """Resources sorted so every one comes after what it requires"""
+        ordered: List[Resource] = []
+        visiting: set = set()
+        done: set = set()
+
+        def visit(resource: Resource) -> None:
+            if resource.name in done:
+                return
+            if resource.name in visiting:
+                raise ValueError(f"Dependency cycle through resource: {resource.name}")
+            visiting.add(resource.name)
+            for name in resource.requires:
+                if name not in self._resources:
+                    raise ValueError(f"{resource.name} requires unknown resource: {name}")
+                visit(self._resources[name])
+            visiting.discard(resource.name)
+            done.add(resource.name)
+            ordered.append(resource)
+
+        for resource in self._resources.values():
+            visit(resource)
+        return ordered
+
+    async def start(self, app: FastAPI) -> None:
+        for resource in self.order():
+            try:
+                if resource.start is not None:
+                    with startup_phase(app, resource.name):
+                        await _call(resource.start, app)
+            except BaseException:
+                logger.exception(f"Failed to start resource {resource.name}")
+                await self.stop(app)
+                raise
+            self._started.append(resource)
+
+    async def stop(self, app: FastAPI) -> None:
+        while self._started:
+            resource = self._started.pop()
+            if resource.stop is None:
+                continue
+            try:
+                await _call(resource.stop, app)
+            except Exception:
+                logger.exception(f"Failed to stop resource {resource.name}")
+
+    @asynccontextmanager
+    async def run(self, app: FastAPI) -> AsyncIterator[None]:
+        await self.start(app)
+        try:
+            yield
+        finally:
+            await self.stop(app)
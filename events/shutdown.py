@@ -1,8 +0,0 @@
-from fastapi import FastAPI
-
-
-def shutdown_event(app: FastAPI):
-    @app.on_event("shutdown")
-    async def shutdown():
-        # Add any cleanup code here
-        pass 
\ No newline at end of file
@@ -0,0 +1,17 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+from fastapi import FastAPI
+
+
+@contextmanager
+def startup_phase(app: FastAPI, name: str) -> Iterator[None]:
+    """Record how long one startup phase took in app.state.startup_timings"""
+    timings: Dict[str, float] = getattr(app.state, "startup_timings", None)
+    if timings is None:
+        timings = app.state.startup_timings = {}
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round((time.perf_counter() - start) * 1000, 2)
@@ -0,0 +1,3 @@
+from .message import Mail, welcome_mail
+from .outbox import MailDispatcher, close_mail_dispatcher, get_mail_dispatcher, mail_configured, queue_mail
+from .transport import DeliveryError, LogTransport, MailTransport, SMTPPool
@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from email.message import EmailMessage
+from email.utils import formataddr, make_msgid
+from typing import Optional
+from config.config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class Mail:
+    """One outgoing message, independent of how it is queued or sent"""
+    to: str
+    subject: str
+    text: str
+    html: Optional[str] = None
+
+
+def sender() -> str:
+    address = settings.MAIL_FROM_ADDRESS or settings.MAIL_USERNAME or "noreply@localhost"
+    return formataddr((settings.MAIL_FROM_NAME, address))
+
+
+def build_message(mail: Mail, from_header: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = from_header
+    message["To"] = mail.to
+    message["Subject"] = mail.subject
+    message["Message-ID"] = make_msgid()
+    message.set_content(mail.text)
+    if mail.html is not None:
+        message.add_alternative(mail.html, subtype="html")
+    return message
+
+
+def welcome_mail(email: str) -> Mail:
+    return Mail(
+        to=email,
+        subject=f"Welcome to {settings.PROJECT_NAME}",
+        text=(
+            f"Hi,\n\nYour {settings.PROJECT_NAME} account {email} is ready.\n\n"
+            f"— The {settings.PROJECT_NAME} team\n"
+        ),
+    )
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Float, Index, Integer, String, Text
+from database.base import Base
+
+
+class OutboxMessage(Base):
+    """Mail waiting to be delivered by the background dispatcher
+
+    Rows are written in the same transaction as the change that triggers
+    them. A worker claims a row by pushing available_at past a lease and
+    stamping claim_token; if it dies mid-send the lease expires and the
+    row is picked up again. Times are epoch seconds.
+    """
+    __tablename__ = "mail_outbox"
+    __table_args__ = (
+        Index("ix_mail_outbox_status_available_at", "status", "available_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    to_address = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    body_text = Column(Text, nullable=False)
+    body_html = Column(Text, nullable=True)
+    status = Column(String(16), nullable=False, default="pending")  # pending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(Float, nullable=False)
+    available_at = Column(Float, nullable=False)
+    sent_at = Column(Float, nullable=True)
+    claim_token = Column(String(32), nullable=True)
+    last_error = Column(Text, nullable=True)
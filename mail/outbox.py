@@ -0,0 +1,297 @@
+"""Transactional mail outbox and the background dispatcher that drains it
+
+queue_mail() only adds a row to the caller's session, so a request pays
+for one INSERT and the mail is sent if and only if its transaction
+commits. Dispatcher workers claim due rows in batches, hand each batch
+to the transport over one pooled connection, and record the outcome:
+sent, retried later with exponential backoff, or failed for good.
+Delivery is at least once; a worker that dies mid-batch leaves its
+claim to expire and the rows are sent again.
+"""
+import asyncio
+import logging
+import random
+import secrets
+import time
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from config.config import settings
+from database.session import get_engine, get_sessionmaker
+from metrics.collectors import MAIL_BATCH_DURATION, MAIL_MESSAGES, MAIL_QUEUE_LAG
+from .message import Mail
+from .models import OutboxMessage
+from .transport import DeliveryResult, LogTransport, MailTransport, SMTPPool
+
+logger = logging.getLogger(__name__)
+
+# Session.info flag set by queue_mail, checked after commit
+_ENQUEUED = "mail_enqueued"
+
+MAX_BACKOFF = 3600
+
+
+def queue_mail(db: AsyncSession, mail: Mail, delay: float = 0) -> OutboxMessage:
+    """Add mail to the outbox within db's transaction; sent after commit"""
+    now = time.time()
+    row = OutboxMessage(
+        to_address=mail.to,
+        subject=mail.subject,
+        body_text=mail.text,
+        body_html=mail.html,
+        status="pending",
+        attempts=0,
+        created_at=now,
+        available_at=now + delay,
+    )
+    db.add(row)
+    db.info[_ENQUEUED] = True
+    return row
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatcher(session: Session) -> None:
+    if session.info.pop(_ENQUEUED, False) and _dispatcher is not None:
+        _dispatcher.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_flag(session: Session) -> None:
+    session.info.pop(_ENQUEUED, None)
+
+
+class MailDispatcher:
+    """Background workers that deliver due outbox rows in batches"""
+
+    def __init__(
+        self,
+        transport: MailTransport,
+        workers: int = 2,
+        batch_size: int = 20,
+        max_attempts: int = 5,
+        retry_backoff: float = 30,
+        poll_interval: float = 2,
+        lease: float = 300,
+    ):
+        self.transport = transport
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.batches = 0
+        self.oldest_due_age = 0.0
+
+    def notify(self) -> None:
+        """Wake idle workers instead of waiting for the next poll"""
+        self._wakeup.set()
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(MAX_BACKOFF, self.retry_backoff * 2 ** (attempts - 1))
+        # Jitter spreads retries of a batch that failed together
+        return delay * random.uniform(0.5, 1.0)
+
+    async def claim(self) -> List[OutboxMessage]:
+        """Lease up to batch_size due rows to this worker"""
+        now = time.time()
+        token = secrets.token_hex(16)
+        async with get_sessionmaker()() as db:
+            stmt = (
+                select(OutboxMessage.id)
+                .filter(OutboxMessage.status == "pending", OutboxMessage.available_at <= now)
+                .order_by(OutboxMessage.available_at)
+                .limit(self.batch_size)
+            )
+            if get_engine().dialect.name == "postgresql":
+                stmt = stmt.with_for_update(skip_locked=True)
+            ids = (await db.execute(stmt)).scalars().all()
+            if not ids:
+                # Nothing due: an idle poll only reads
+                return []
+            # Rows whose leases kept expiring (e.g. the worker died mid-batch)
+            # already used every attempt; fail them instead of claiming again
+            exhausted = await db.execute(
+                update(OutboxMessage)
+                .where(
+                    OutboxMessage.id.in_(ids),
+                    OutboxMessage.status == "pending",
+                    OutboxMessage.available_at <= now,
+                    OutboxMessage.attempts >= self.max_attempts,
+                )
+                .values(status="failed", claim_token=None, last_error="Gave up after the last attempt's lease expired")
+                .execution_options(synchronize_session=False)
+            )
+            if exhausted.rowcount:
+                MAIL_MESSAGES.labels("failed").inc(exhausted.rowcount)
+                self.failed += exhausted.rowcount
+                logger.error(f"{exhausted.rowcount} mail(s) failed after {self.max_attempts} attempt(s)")
+            # The status/available_at guard keeps a concurrent claimer from
+            # taking the same rows on databases without SKIP LOCKED
+            await db.execute(
+                update(OutboxMessage)
+                .where(
+                    OutboxMessage.id.in_(ids),
+                    OutboxMessage.status == "pending",
+                    OutboxMessage.available_at <= now,
+                    OutboxMessage.attempts < self.max_attempts,
+                )
+                .values(
+                    available_at=now + self.lease,
+                    claim_token=token,
+                    attempts=OutboxMessage.attempts + 1,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            result = await db.execute(
+                select(OutboxMessage)
+                .filter(OutboxMessage.id.in_(ids), OutboxMessage.claim_token == token)
+                .order_by(OutboxMessage.id)
+            )
+            rows = result.scalars().all()
+            await db.commit()
+        if rows:
+            self.oldest_due_age = max(0.0, now - min(row.created_at for row in rows))
+        return rows
+
+    async def record(self, rows: Sequence[OutboxMessage], results: Sequence[DeliveryResult]) -> None:
+        """Store the outcome of a delivered batch"""
+        now = time.time()
+        updates: List[Dict[str, Any]] = []
+        for row, error in zip(rows, results):
+            if error is None:
+                updates.append({"id": row.id, "status": "sent", "sent_at": now, "available_at": now,
+                                "claim_token": None, "last_error": None})
+                MAIL_QUEUE_LAG.observe(now - row.created_at)
+                MAIL_MESSAGES.labels("sent").inc()
+                self.sent += 1
+            elif error.permanent or row.attempts >= self.max_attempts:
+                updates.append({"id": row.id, "status": "failed", "sent_at": None, "available_at": now,
+                                "claim_token": None, "last_error": error.reason})
+                MAIL_MESSAGES.labels("failed").inc()
+                self.failed += 1
+                logger.error(f"Mail {row.id} to {row.to_address} failed after {row.attempts} attempt(s): {error.reason}")
+            else:
+                updates.append({"id": row.id, "status": "pending", "sent_at": None,
+                                "available_at": now + self._backoff(row.attempts),
+                                "claim_token": None, "last_error": error.reason})
+                MAIL_MESSAGES.labels("retried").inc()
+                self.retried += 1
+        async with get_sessionmaker()() as db:
+            # ORM bulk UPDATE by primary key: one executemany for the batch
+            await db.execute(update(OutboxMessage), updates)
+            await db.commit()
+
+    async def run_once(self) -> int:
+        """Claim, send and record one batch; returns the number of rows handled"""
+        rows = await self.claim()
+        if not rows:
+            return 0
+        started = time.perf_counter()
+        mails = [Mail(row.to_address, row.subject, row.body_text, row.body_html) for row in rows]
+        results = await self.transport.send_batch(mails)
+        await self.record(rows, results)
+        MAIL_BATCH_DURATION.observe(time.perf_counter() - started)
+        self.batches += 1
+        return len(rows)
+
+    async def _worker(self) -> None:
+        while not self._stopping:
+            # Cleared before claiming, so a notify() during an empty claim
+            # still cuts the wait below short
+            self._wakeup.clear()
+            try:
+                handled = await self.run_once()
+            except Exception as e:
+                logger.warning(f"Mail dispatch failed: {e}")
+                handled = 0
+            if handled:
+                continue
+            self.oldest_due_age = 0.0
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        self._stopping = False
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 10) -> None:
+        """Let in-flight batches finish, then cancel; unfinished claims expire and retry"""
+        self._stopping = True
+        self._wakeup.set()
+        tasks, self._tasks = self._tasks, []
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        await self.transport.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "batches": self.batches,
+            "oldest_due_age": round(self.oldest_due_age, 3),
+            "transport": self.transport.stats(),
+        }
+
+
+_dispatcher: Optional[MailDispatcher] = None
+
+
+def create_transport(name: str) -> MailTransport:
+    """Build a mail transport from its MAIL_MAILER name"""
+    if name == "smtp":
+        return SMTPPool(
+            host=settings.MAIL_HOST,
+            port=settings.MAIL_PORT,
+            username=settings.MAIL_USERNAME,
+            password=settings.MAIL_PASSWORD,
+            encryption=settings.MAIL_ENCRYPTION,
+            size=settings.MAIL_POOL_SIZE,
+            timeout=settings.MAIL_TIMEOUT,
+        )
+    if name == "log":
+        return LogTransport()
+    raise ValueError(f"Unsupported mailer: {name}")
+
+
+def mail_configured() -> bool:
+    """Whether MAIL_MAILER can deliver: log always, smtp with a host and a sender"""
+    if settings.MAIL_MAILER == "smtp":
+        return bool(settings.MAIL_HOST and (settings.MAIL_FROM_ADDRESS or settings.MAIL_USERNAME))
+    return True
+
+
+def get_mail_dispatcher() -> MailDispatcher:
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = MailDispatcher(
+            create_transport(settings.MAIL_MAILER),
+            workers=settings.MAIL_WORKERS,
+            batch_size=settings.MAIL_BATCH_SIZE,
+            max_attempts=settings.MAIL_MAX_ATTEMPTS,
+            retry_backoff=settings.MAIL_RETRY_BACKOFF,
+            poll_interval=settings.MAIL_POLL_INTERVAL,
+        )
+    return _dispatcher
+
+
+async def close_mail_dispatcher(timeout: float = 10) -> None:
+    global _dispatcher
+    if _dispatcher is not None:
+        await _dispatcher.stop(timeout)
+        _dispatcher = None
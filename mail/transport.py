@@ -0,0 +1,174 @@
+"""Mail transports used by the outbox dispatcher
+
+SMTP is blocking, so every network step runs in a worker thread. The
+pool keeps authenticated connections open between batches: connect,
+STARTTLS and AUTH are paid once per connection instead of per message.
+"""
+import asyncio
+import logging
+import smtplib
+import ssl
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+from .message import Mail, build_message, sender
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class DeliveryError:
+    """Why one message was not accepted; permanent errors are not retried"""
+    reason: str
+    permanent: bool = False
+
+
+# Per-message outcome: None when the server accepted the message
+DeliveryResult = Optional[DeliveryError]
+
+
+class MailTransport:
+    async def send_batch(self, mails: Sequence[Mail]) -> List[DeliveryResult]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+
+class LogTransport(MailTransport):
+    """Logs instead of sending, for local development (MAIL_MAILER=log)"""
+
+    async def send_batch(self, mails: Sequence[Mail]) -> List[DeliveryResult]:
+        for mail in mails:
+            logger.info(f"Mail to {mail.to}: {mail.subject}")
+        return [None] * len(mails)
+
+
+class SMTPPool(MailTransport):
+    """Bounded pool of reusable, authenticated SMTP connections"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        encryption: Optional[str] = None,
+        size: int = 2,
+        timeout: float = 10,
+        max_idle: float = 60,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.encryption = (encryption or "").lower()
+        self.size = size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._slots = asyncio.Semaphore(size)
+        self._idle: List[Tuple[smtplib.SMTP, float]] = []
+        self._from = sender()
+        self.connects = 0
+        self.reuses = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.encryption == "ssl":
+            conn = smtplib.SMTP_SSL(
+                self.host, self.port, timeout=self.timeout, context=ssl.create_default_context()
+            )
+        else:
+            conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.encryption == "tls":
+                conn.starttls(context=ssl.create_default_context())
+        if self.username:
+            conn.login(self.username, self.password or "")
+        return conn
+
+    @staticmethod
+    def _alive(conn: smtplib.SMTP) -> bool:
+        try:
+            return conn.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _quit(conn: smtplib.SMTP) -> None:
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.close()
+
+    async def _acquire(self) -> smtplib.SMTP:
+        while self._idle:
+            conn, released_at = self._idle.pop()
+            # Servers drop idle sessions; probe before reusing a stale one
+            if time.monotonic() - released_at < self.max_idle or await asyncio.to_thread(self._alive, conn):
+                self.reuses += 1
+                return conn
+            await asyncio.to_thread(self._quit, conn)
+        self.connects += 1
+        return await asyncio.to_thread(self._connect)
+
+    def _deliver(self, conn: smtplib.SMTP, mails: Sequence[Mail]) -> Tuple[List[DeliveryResult], bool]:
+        """Send mails over one connection; the flag is set when it broke"""
+        results: List[DeliveryResult] = []
+        for i, mail in enumerate(mails):
+            try:
+                refused = conn.send_message(build_message(mail, self._from))
+                results.append(
+                    DeliveryError(f"Recipient refused: {refused}", permanent=True) if refused else None
+                )
+            except smtplib.SMTPRecipientsRefused as e:
+                code = next(iter(e.recipients.values()))[0]
+                results.append(DeliveryError(str(e.recipients), permanent=code >= 500))
+            except smtplib.SMTPResponseException as e:
+                results.append(DeliveryError(f"{e.smtp_code} {e.smtp_error!r}", permanent=e.smtp_code >= 500))
+                # A failed transaction leaves the session usable after RSET
+                try:
+                    conn.rset()
+                except (smtplib.SMTPException, OSError):
+                    results.extend(DeliveryError("Connection lost") for _ in mails[i + 1:])
+                    return results, True
+            except (smtplib.SMTPException, OSError) as e:
+                results.append(DeliveryError(str(e) or type(e).__name__))
+                results.extend(DeliveryError("Connection lost") for _ in mails[i + 1:])
+                return results, True
+            except Exception as e:
+                # The message itself cannot be built or encoded; retrying will not help
+                results.append(DeliveryError(f"Invalid message: {e!r}", permanent=True))
+                try:
+                    conn.rset()
+                except (smtplib.SMTPException, OSError):
+                    results.extend(DeliveryError("Connection lost") for _ in mails[i + 1:])
+                    return results, True
+        return results, False
+
+    async def send_batch(self, mails: Sequence[Mail]) -> List[DeliveryResult]:
+        async with self._slots:
+            try:
+                conn = await self._acquire()
+            except (smtplib.SMTPException, OSError) as e:
+                # Connect or AUTH failed: a server problem, retry everything later
+                error = DeliveryError(f"SMTP connect failed: {e}")
+                return [error] * len(mails)
+            broken = True
+            try:
+                results, broken = await asyncio.to_thread(self._deliver, conn, mails)
+            finally:
+                if broken:
+                    conn.close()
+                else:
+                    self._idle.append((conn, time.monotonic()))
+            return results
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            await asyncio.to_thread(self._quit, conn)
+
+    def stats(self) -> dict:
+        return {"size": self.size, "idle": len(self._idle), "connects": self.connects, "reuses": self.reuses}
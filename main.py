@@ -1,7 +1,15 @@
-from fastapi import FastAPI
+import math
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from app.common.responses import FastJSONResponse
+from app.common.schemas.base_response import BaseResponse
 from config.config import settings
-from events import create_start_app_handler, create_stop_app_handler
+from config.hashing import HashingPoolSaturated
+from ratelimit import RateLimitExceeded
+from events import lifespan, startup_phase
 from middlewares import setup_middlewares
 from routes import router
 
@@ -18,6 +26,18 @@ LOGO = """
  Documentation: http://{host}:{port}/docs
 """
 
+
+@asynccontextmanager
+async def app_lifespan(application: FastAPI) -> AsyncIterator[None]:
+    async with lifespan(application):
+        print(LOGO.format(
+            version=settings.VERSION,
+            host=settings.HOST,
+            port=settings.PORT
+        ))
+        yield
+
+
 def get_application() -> FastAPI:
     application = FastAPI(
         title=settings.PROJECT_NAME,
@@ -26,6 +46,8 @@ def get_application() -> FastAPI:
         docs_url=settings.DOCS_URL,
         redoc_url=settings.REDOC_URL,
         openapi_url=settings.OPENAPI_URL,
+        default_response_class=FastJSONResponse,
+        lifespan=app_lifespan,
     )
 
     # Set up CORS
@@ -38,24 +60,44 @@ def get_application() -> FastAPI:
     )
 
     # Set up other middlewares
-    setup_middlewares(application)
+    with startup_phase(application, "middlewares"):
+        setup_middlewares(application)
 
-    # Add event handlers
-    application.add_event_handler("startup", create_start_app_handler(application))
-    application.add_event_handler("shutdown", create_stop_app_handler(application))
+    # Reject with 503 instead of queueing unbounded bcrypt work
+    @application.exception_handler(HashingPoolSaturated)
+    async def hashing_pool_saturated_handler(request: Request, exc: HashingPoolSaturated):
+        return JSONResponse(
+            status_code=503,
+            content=BaseResponse(code=503, msg="Service busy, please retry").model_dump(),
+            headers={"Retry-After": "1"},
+        )
 
-    # Add startup logo
-    @application.on_event("startup")
-    async def display_logo():
-        print(LOGO.format(
-            version=settings.VERSION,
-            host=settings.HOST,
-            port=settings.PORT
-        ))
+    @application.exception_handler(RateLimitExceeded)
+    async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+        return JSONResponse(
+            status_code=429,
+            content=BaseResponse(code=429, msg="Too many requests").model_dump(),
+            headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+        )
 
     # Include all routes
-    application.include_router(router)
+    with startup_phase(application, "routes"):
+        application.include_router(router)
 
     return application
 
-app = get_application() 
\ No newline at end of file
+
+_app: Optional[FastAPI] = None
+
+
+def __getattr__(name: str):
+    # Build the application on first access of `main.app` rather than at
+    # import; `uvicorn main:app` still works, and so does
+    # `uvicorn --factory main:get_application`.
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = get_application()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+ 
\ No newline at end of file
@@ -0,0 +1,54 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+from config.config import settings
+from .exposition import CONTENT_TYPE, render
+from .multiprocess import read_shards, write_shard
+from .registry import REGISTRY, Counter, Gauge, Histogram, Registry
+
+logger = logging.getLogger(__name__)
+
+_flusher: Optional[asyncio.Task] = None
+
+
+def _publish_and_merge(families: List[Dict[str, Any]], directory: str) -> List[Dict[str, Any]]:
+    write_shard(families, directory)
+    return read_shards(directory)
+
+
+async def collect() -> List[Dict[str, Any]]:
+    """Metric families of this process, or of all workers when METRICS_DIR is set"""
+    if not settings.METRICS_DIR:
+        return REGISTRY.snapshot()
+    # Snapshot on the loop; shard file I/O and JSON run in a thread
+    return await asyncio.to_thread(_publish_and_merge, REGISTRY.snapshot(), settings.METRICS_DIR)
+
+
+async def _flush_periodically(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            # Snapshot on the loop, write the file from a thread
+            await asyncio.to_thread(write_shard, REGISTRY.snapshot(), settings.METRICS_DIR)
+        except OSError as e:
+            logger.warning(f"Failed to write metrics shard: {e}")
+
+
+def start_metrics_flusher() -> None:
+    """Periodically publish this worker's shard so any worker can serve totals"""
+    global _flusher
+    if settings.METRICS_DIR and _flusher is None:
+        _flusher = asyncio.create_task(_flush_periodically(settings.METRICS_FLUSH_INTERVAL))
+
+
+async def stop_metrics_flusher() -> None:
+    global _flusher
+    if _flusher is None:
+        return
+    _flusher.cancel()
+    try:
+        await _flusher
+    except asyncio.CancelledError:
+        pass
+    _flusher = None
+    await asyncio.to_thread(write_shard, REGISTRY.snapshot(), settings.METRICS_DIR)
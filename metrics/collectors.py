@@ -0,0 +1,135 @@
+import time
+from typing import Dict
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from .registry import REGISTRY, LabelValues
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "HTTP requests by route template", ("method", "route", "status")
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+)
+HTTP_IN_PROGRESS = REGISTRY.gauge(
+    "http_requests_in_progress", "HTTP requests currently being served"
+)
+DB_QUERY_LATENCY = REGISTRY.histogram(
+    "db_query_duration_seconds",
+    "Time spent executing SQL statements",
+    ("engine",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+COMPRESSION_BYTES = REGISTRY.counter(
+    "http_compression_bytes_total", "Response bytes before (in) and after (out) compression", ("encoding", "stage")
+)
+RATE_LIMITED = REGISTRY.counter(
+    "rate_limit_rejections_total", "Requests rejected by a rate limit", ("scope",)
+)
+SINGLEFLIGHT_CALLS = REGISTRY.counter(
+    "singleflight_calls_total", "Calls made through a single-flight group", ("name",)
+)
+SINGLEFLIGHT_EXECUTIONS = REGISTRY.counter(
+    "singleflight_executions_total", "Calls that actually executed; calls minus executions were shared", ("name",)
+)
+SINGLEFLIGHT_FAN_IN = REGISTRY.histogram(
+    "singleflight_fan_in",
+    "Callers served by one execution",
+    ("name",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+SESSIONS_EXPIRED = REGISTRY.counter(
+    "sessions_expired_total", "Idle sessions dropped by the session store sweeper"
+)
+MAIL_MESSAGES = REGISTRY.counter(
+    "mail_messages_total", "Outbox messages by delivery outcome (sent, retried, failed)", ("result",)
+)
+MAIL_QUEUE_LAG = REGISTRY.histogram(
+    "mail_queue_lag_seconds",
+    "Time from queueing a message to its delivery",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 3600),
+)
+MAIL_BATCH_DURATION = REGISTRY.histogram(
+    "mail_batch_duration_seconds", "Time to send and record one outbox batch"
+)
+
+_engines: Dict[str, AsyncEngine] = {}
+
+
+def init_route_metrics(app: FastAPI) -> None:
+    """Create a zero-valued latency series for every API route template"""
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            for method in route.methods:
+                HTTP_LATENCY.labels(method, route.path)
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Time every statement run through engine and export its pool state"""
+    if name in _engines:
+        return
+    _engines[name] = engine
+    sync_engine = engine.sync_engine
+    latency = DB_QUERY_LATENCY.labels(name)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        latency.observe(time.perf_counter() - conn.info["query_start"].pop())
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _failed(context):
+        # after_cursor_execute does not run for a failed statement
+        if context.connection is not None and context.execution_context is not None:
+            starts = context.connection.info.get("query_start")
+            if starts:
+                starts.pop()
+
+
+def _pool_values(field: str) -> Dict[LabelValues, float]:
+    from database.pool import pool_status
+
+    values: Dict[LabelValues, float] = {}
+    for name, engine in _engines.items():
+        status = pool_status(engine.pool)
+        if field in status:
+            values[(name,)] = status[field]
+    return values
+
+
+def _hashing_value(field: str) -> Dict[LabelValues, float]:
+    from config.hashing import get_hashing_pool
+
+    return {(): get_hashing_pool().stats()[field]}
+
+
+def _principal_cache_value(field: str) -> Dict[LabelValues, float]:
+    from config.principal_cache import get_principal_cache
+
+    return {(): get_principal_cache().stats()[field]}
+
+
+def _mail_value(field: str) -> Dict[LabelValues, float]:
+    from mail.outbox import _dispatcher
+
+    return {(): _dispatcher.stats()[field]} if _dispatcher is not None else {}
+
+
+REGISTRY.gauge("db_pool_size", "Configured pool size", ("engine",), lambda: _pool_values("size"))
+REGISTRY.gauge("db_pool_in_use", "Connections checked out", ("engine",), lambda: _pool_values("in_use"))
+REGISTRY.gauge("db_pool_overflow", "Connections open beyond pool_size", ("engine",), lambda: _pool_values("overflow"))
+REGISTRY.counter("db_pool_checkouts_total", "Connection checkouts", ("engine",), lambda: _pool_values("checkouts"))
+REGISTRY.counter("db_pool_timeouts_total", "Checkouts that timed out", ("engine",), lambda: _pool_values("timeouts"))
+REGISTRY.gauge("db_pool_wait_max_seconds", "Longest checkout wait", ("engine",),
+               lambda: {k: v / 1000 for k, v in _pool_values("wait_max_ms").items()}, merge="max")
+REGISTRY.gauge("hashing_queue_depth", "Password hashes queued or running", collect=lambda: _hashing_value("queue_depth"))
+REGISTRY.counter("hashing_completed_total", "Password hashes completed", collect=lambda: _hashing_value("completed"))
+REGISTRY.counter("hashing_rejected_total", "Password hashes rejected with 503", collect=lambda: _hashing_value("rejected"))
+REGISTRY.gauge("mail_outbox_oldest_age_seconds", "Age of the oldest message in the last claimed batch",
+               collect=lambda: _mail_value("oldest_due_age"), merge="max")
+REGISTRY.counter("principal_cache_hits_total", "Principal cache hits", collect=lambda: _principal_cache_value("hits"))
+REGISTRY.counter("principal_cache_misses_total", "Principal cache misses", collect=lambda: _principal_cache_value("misses"))
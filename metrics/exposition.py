@@ -0,0 +1,43 @@
+from typing import Any, Dict, Iterable, List
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: List[str], values: List[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def render(families: Iterable[Dict[str, Any]]) -> str:
+    """Render metric snapshots in the Prometheus text exposition format"""
+    lines: List[str] = []
+    for family in families:
+        name = family["name"]
+        names = family["labelnames"]
+        lines.append(f"# HELP {name} {_escape(family['help'])}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for values, sample in family["samples"]:
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_labels(names, values)} {_format_value(sample)}")
+                continue
+            cumulative = 0
+            bounds = [*family["buckets"], float("inf")]
+            for bound, count in zip(bounds, sample["counts"]):
+                cumulative += count
+                le = 'le="%s"' % _format_value(bound)
+                lines.append(f"{name}_bucket{_labels(names, values, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, values)} {_format_value(sample['sum'])}")
+            lines.append(f"{name}_count{_labels(names, values)} {cumulative}")
+    return "\n".join(lines) + "\n"
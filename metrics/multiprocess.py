@@ -0,0 +1,67 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+
+def write_shard(families: List[Dict[str, Any]], directory: str) -> None:
+    """Persist this process's metric snapshot as <pid>.json in directory"""
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    pid = os.getpid()
+    data = json.dumps({"pid": pid, "metrics": families}, separators=(",", ":"))
+    tmp = path / f"{pid}.json.tmp"
+    tmp.write_text(data)
+    os.replace(tmp, path / f"{pid}.json")
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_shards(directory: str) -> List[Dict[str, Any]]:
+    """Merge every shard in directory into one list of metric families
+
+    Counters and histograms are summed over all shards, including those
+    of exited workers, so totals survive restarts. Gauges only count
+    live processes and are summed unless their family asks for "max".
+    """
+    families: Dict[str, Dict[str, Any]] = {}
+    samples: Dict[str, Dict[Tuple[str, ...], Any]] = {}
+    for file in sorted(Path(directory).glob("*.json")):
+        try:
+            shard = json.loads(file.read_text())
+        except (OSError, ValueError):
+            continue
+        alive = _alive(shard["pid"])
+        for family in shard["metrics"]:
+            if family["type"] == "gauge" and not alive:
+                continue
+            name = family["name"]
+            if name not in families:
+                families[name] = {**family, "samples": []}
+                samples[name] = {}
+            merged = samples[name]
+            for values, value in family["samples"]:
+                key = tuple(values)
+                current = merged.get(key)
+                if current is None:
+                    merged[key] = value
+                elif family["type"] == "histogram":
+                    merged[key] = {
+                        "counts": [a + b for a, b in zip(current["counts"], value["counts"])],
+                        "sum": current["sum"] + value["sum"],
+                    }
+                elif family.get("merge") == "max":
+                    merged[key] = max(current, value)
+                else:
+                    merged[key] = current + value
+    for name, family in families.items():
+        family["samples"] = [[list(key), value] for key, value in samples[name].items()]
+    return list(families.values())
@@ -1,10 +1,32 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from config.config import settings
+from .compression import CompressionMiddleware, parse_encodings, parse_route_levels
+from .drain import DrainMiddleware, InFlightTracker
+from .logging import AccessLogMiddleware, parse_sample_rates
+from .metrics import MetricsMiddleware
+from .session import SessionMiddleware
 
 def setup_middlewares(app: FastAPI) -> None:
     """Set up all middlewares for the application"""
-    
+
+    # Innermost: compress the response body, so the outer middlewares
+    # (and access log byte counts) see what goes over the wire
+    app.add_middleware(
+        CompressionMiddleware,
+        encodings=parse_encodings(settings.COMPRESSION_ENCODINGS),
+        min_size=settings.COMPRESSION_MIN_SIZE,
+        route_levels=parse_route_levels(settings.COMPRESSION_ROUTE_LEVELS),
+        offload_size=settings.COMPRESSION_OFFLOAD_SIZE,
+    )
+
+    # Cookie sessions, read from the store only by routes that use them
+    app.add_middleware(
+        SessionMiddleware,
+        cookie_name=settings.SESSION_COOKIE,
+        secure=settings.SESSION_SECURE_COOKIE,
+    )
+
     # Add CORS middleware
     app.add_middleware(
         CORSMiddleware,
@@ -13,3 +35,17 @@ def setup_middlewares(app: FastAPI) -> None:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+
+    # Add request metrics middleware
+    app.add_middleware(MetricsMiddleware)
+
+    # Add access log middleware
+    app.add_middleware(
+        AccessLogMiddleware,
+        sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+        route_sample_rates=parse_sample_rates(settings.ACCESS_LOG_ROUTE_SAMPLE_RATES),
+    )
+
+    # Outermost: count in-flight requests so shutdown can drain them
+    app.state.in_flight = InFlightTracker()
+    app.add_middleware(DrainMiddleware, tracker=app.state.in_flight)
@@ -0,0 +1,257 @@
+"""Pure ASGI response compression with zstd, brotli and gzip
+
+The encoding is negotiated from Accept-Encoding (q-values honoured,
+server preference breaking ties). Responses are compressed only when
+their content type is allowlisted and the body reaches min_size.
+Complete bodies are compressed in one call. Streamed bodies
+(StreamingResponse exports) are compressed chunk by chunk with a sync
+flush, so clients still receive rows as they are produced. Chunks of
+offload_size or more (an eighth of that at CPU-heavy levels) are
+compressed in a worker thread: zlib, brotli and zstd release the GIL,
+so the event loop keeps serving.
+
+zstd and brotli are optional; without the zstandard / brotli packages
+only gzip is offered.
+"""
+import asyncio
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from metrics.collectors import COMPRESSION_BYTES
+from .logging import route_template
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+DEFAULT_CONTENT_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._obj.compress(data) + self._obj.flush()
+
+
+class _Brotli:
+    def __init__(self, level: int):
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data) + self._obj.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._obj.process(data) + self._obj.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._obj.compress(data) + self._obj.flush()
+
+
+# name -> (compressor, default level, (min level, max level), first CPU-heavy level)
+CODECS: Dict[str, Tuple[Callable[[int], Any], int, Tuple[int, int], int]] = {}
+if zstandard is not None:
+    CODECS["zstd"] = (_Zstd, 3, (1, 22), 10)
+if brotli is not None:
+    CODECS["br"] = (_Brotli, 4, (0, 11), 8)
+CODECS["gzip"] = (_Gzip, 6, (1, 9), 9)
+
+
+def parse_encodings(spec: Optional[str]) -> List[str]:
+    """Parse "zstd,br,gzip" into the available encodings in preference order"""
+    names = [name.strip() for name in (spec or "").split(",")]
+    return [name for name in names if name in CODECS]
+
+
+def parse_route_levels(spec: Optional[str]) -> Dict[str, int]:
+    """Parse "/v1/articles/export=1,/openapi.json=9" into a route -> level map"""
+    levels: Dict[str, int] = {}
+    for item in (spec or "").split(","):
+        route, sep, level = item.strip().rpartition("=")
+        if sep and route:
+            levels[route] = int(level)
+    return levels
+
+
+def negotiate(accept_encoding: str, encodings: List[str]) -> Optional[str]:
+    """Best encoding in encodings acceptable per an Accept-Encoding header"""
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                continue
+        weights[name.strip().lower()] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name in encodings:
+        q = weights.get(name, wildcard)
+        # Strictly greater: earlier encodings win ties
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class CompressionMiddleware:
+    """Negotiate, then compress eligible responses whole or chunk by chunk"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: Iterable[str] = ("zstd", "br", "gzip"),
+        min_size: int = 1024,
+        content_types: Iterable[str] = DEFAULT_CONTENT_TYPES,
+        route_levels: Optional[Dict[str, int]] = None,
+        offload_size: int = 256 * 1024,
+    ):
+        self.app = app
+        self.encodings = [name for name in encodings if name in CODECS]
+        self.min_size = min_size
+        self.content_types = tuple(content_types)
+        self.route_levels = route_levels or {}
+        self.offload_size = offload_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        responder = _CompressionResponder(self, scope, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+    def compressible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+        return content_type.startswith(self.content_types)
+
+    def level(self, scope: Scope, encoding: str) -> int:
+        """Route override (clamped to the codec's range) or the codec default"""
+        _, default, (low, high), _ = CODECS[encoding]
+        level = self.route_levels.get(route_template(scope))
+        return default if level is None else max(low, min(high, level))
+
+
+class _CompressionResponder:
+    """Per-request send wrapper: holds the start message until the first body chunk"""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, send: Send, encoding: Optional[str]):
+        self.middleware = middleware
+        self.scope = scope
+        self.downstream = send
+        self.encoding = encoding
+        self.start: Optional[Message] = None
+        self.buffer: List[bytes] = []
+        self.buffered = 0
+        self.compressor: Any = None
+        self.offload_at = middleware.offload_size
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if self.passthrough:
+            await self.downstream(message)
+            return
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            if message["status"] in (204, 304) or not self.middleware.compressible(headers):
+                self.passthrough = True
+                await self.downstream(message)
+                return
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+        if self.compressor is not None:
+            await self._send_compressed(body, more)
+            return
+
+        self.buffer.append(body)
+        self.buffered += len(body)
+        if more and self.buffered < self.middleware.min_size:
+            # Wait for enough of a streamed body to judge whether it is worth it
+            return
+        body = b"".join(self.buffer)
+        self.buffer = []
+        if self.encoding is None or self.buffered < self.middleware.min_size:
+            await self._send_uncompressed(body, more)
+            return
+        level = self.middleware.level(self.scope, self.encoding)
+        if level == 0:
+            await self._send_uncompressed(body, more)
+            return
+
+        factory, _, _, heavy = CODECS[self.encoding]
+        self.compressor = factory(level)
+        self.offload_at = self.middleware.offload_size // 8 if level >= heavy else self.middleware.offload_size
+        headers = MutableHeaders(scope=self.start)
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # Same entity, different bytes: the ETag can no longer be strong
+            headers["ETag"] = f"W/{etag}"
+        if more:
+            del headers["content-length"]
+            await self.downstream(self.start)
+            await self._send_compressed(body, more)
+            return
+        compressed = await self._run(self.compressor.finish, body)
+        self._count(len(body), len(compressed))
+        headers["Content-Length"] = str(len(compressed))
+        await self.downstream(self.start)
+        await self.downstream({"type": "http.response.body", "body": compressed})
+
+    async def _send_uncompressed(self, body: bytes, more: bool) -> None:
+        self.passthrough = True
+        MutableHeaders(scope=self.start).add_vary_header("Accept-Encoding")
+        await self.downstream(self.start)
+        await self.downstream({"type": "http.response.body", "body": body, "more_body": more})
+
+    async def _send_compressed(self, body: bytes, more: bool) -> None:
+        compressed = await self._run(self.compressor.compress if more else self.compressor.finish, body)
+        self._count(len(body), len(compressed))
+        if compressed or not more:
+            await self.downstream({"type": "http.response.body", "body": compressed, "more_body": more})
+
+    async def _run(self, func: Callable[[bytes], bytes], data: bytes) -> bytes:
+        if len(data) >= self.offload_at:
+            return await asyncio.to_thread(func, data)
+        return func(data)
+
+    def _count(self, raw: int, compressed: int) -> None:
+        COMPRESSION_BYTES.labels(self.encoding, "in").inc(raw)
+        COMPRESSION_BYTES.labels(self.encoding, "out").inc(compressed)
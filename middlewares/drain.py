@@ -0,0 +1,75 @@
+import asyncio
+from typing import Optional
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class InFlightTracker:
+    """Counts in-flight HTTP requests so shutdown can wait for them"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.draining = False
+        self.rejected = 0
+        self._idle: Optional[asyncio.Event] = None
+
+    def _event(self) -> asyncio.Event:
+        if self._idle is None:
+            self._idle = asyncio.Event()
+            if self.in_flight == 0:
+                self._idle.set()
+        return self._idle
+
+    def enter(self) -> None:
+        self.in_flight += 1
+        self._event().clear()
+
+    def exit(self) -> None:
+        self.in_flight -= 1
+        if self.in_flight == 0:
+            self._event().set()
+
+    async def drain(self, timeout: float) -> bool:
+        """Stop admitting requests and wait up to timeout for in-flight ones
+
+        Returns False if requests were still running when time ran out.
+        """
+        self.draining = True
+        try:
+            await asyncio.wait_for(self._event().wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+class DrainMiddleware:
+    """Track in-flight requests and turn new ones away while draining"""
+
+    def __init__(self, app: ASGIApp, tracker: InFlightTracker):
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if self.tracker.draining:
+            self.tracker.rejected += 1
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"connection", b"close"),
+                    (b"retry-after", b"1"),
+                ],
+            })
+            await send({
+                "type": "http.response.body",
+                "body": b'{"code":503,"msg":"Server is shutting down","data":null}',
+            })
+            return
+        self.tracker.enter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.tracker.exit()
@@ -1,22 +1,131 @@
-import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+import json
 import logging
+import queue
+import random
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+# Application loggers log INFO to stderr; access records have their own handler
 logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        
-        response = await call_next(request)
-        
-        process_time = time.time() - start_time
-        logger.info(
-            f"Method: {request.method} Path: {request.url.path} "
-            f"Status: {response.status_code} Duration: {process_time:.2f}s"
-        )
-        
-        return response 
\ No newline at end of file
+logger = logging.getLogger("access")
+
+_listener: Optional[QueueListener] = None
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queue handler that leaves formatting to the listener thread
+
+    The stock QueueHandler formats the message in the calling thread,
+    which would put string building back on the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class AccessLogFormatter(logging.Formatter):
+    """Render access records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = getattr(record, "access", None)
+        if data is None:
+            return super().format(record)
+        return json.dumps({"ts": round(record.created, 3), **data}, separators=(",", ":"))
+
+
+def start_access_log(handler: Optional[logging.Handler] = None) -> None:
+    """Ship access records to handler from a background thread"""
+    global _listener
+    if _listener is not None:
+        return
+    if handler is None:
+        handler = logging.StreamHandler()
+    handler.setFormatter(AccessLogFormatter())
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(_DeferredQueueHandler(records))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    _listener = QueueListener(records, handler)
+    _listener.start()
+
+
+def stop_access_log() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    for handler in list(logger.handlers):
+        if isinstance(handler, _DeferredQueueHandler):
+            logger.removeHandler(handler)
+
+
+def parse_sample_rates(spec: Optional[str]) -> Dict[str, float]:
+    """Parse "/v1/health=0.01,/v1/users/me=0.1" into a route -> rate map"""
+    rates: Dict[str, float] = {}
+    for item in (spec or "").split(","):
+        route, sep, rate = item.strip().rpartition("=")
+        if sep and route:
+            rates[route] = float(rate)
+    return rates
+
+
+def route_template(scope: Scope) -> str:
+    """Route path template of a handled request, e.g. /v1/users/{user_id}"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+class AccessLogMiddleware:
+    """Pure ASGI access log with per-route sampling
+
+    Records method, route template, status, response bytes and duration.
+    Server errors are always logged regardless of the sampling rate.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = 1.0,
+        route_sample_rates: Optional[Dict[str, float]] = None,
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.route_sample_rates = route_sample_rates or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter_ns()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ns = time.perf_counter_ns() - start
+            route = route_template(scope)
+            rate = self.route_sample_rates.get(route, self.sample_rate)
+            if status >= 500 or rate >= 1.0 or random.random() < rate:
+                access: Dict[str, Any] = {
+                    "method": scope["method"],
+                    "route": route,
+                    "status": status,
+                    "bytes": size,
+                    "duration_ms": duration_ns / 1e6,
+                    "sample_rate": rate,
+                }
+                logger.info("access", extra={"access": access})
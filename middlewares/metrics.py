@@ -0,0 +1,35 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from metrics.collectors import HTTP_IN_PROGRESS, HTTP_LATENCY, HTTP_REQUESTS
+from .logging import route_template
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request counts and latency per route"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.in_progress = HTTP_IN_PROGRESS.labels()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.in_progress.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.in_progress.dec()
+            route = route_template(scope)
+            HTTP_LATENCY.labels(scope["method"], route).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(scope["method"], route, status).inc()
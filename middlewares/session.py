@@ -0,0 +1,59 @@
+"""Pure ASGI cookie sessions backed by a server-side store
+
+The cookie holds only a random session id. The middleware puts an
+unloaded Session in scope["session"], and the store is read only when a
+route depends on get_session. When the response starts, the session is
+written back if it changed. The Set-Cookie header is sent only when
+the id changes (new, regenerated or invalidated session). The cookie
+has no Max-Age, so it lasts for the browser session. The server-side
+idle lifetime (SESSION_LIFETIME) is what logs users out.
+"""
+from typing import Callable, Optional
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from sessions import Session, SessionStore, get_session_store
+from sessions.session import decode_session_id
+
+
+class SessionMiddleware:
+    """Attach a lazily loaded Session to every HTTP request"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        cookie_name: str = "llama_session",
+        store: Optional[Callable[[], SessionStore]] = None,
+        path: str = "/",
+        same_site: str = "lax",
+        secure: bool = False,
+    ):
+        self.app = app
+        self.cookie_name = cookie_name
+        # Resolved per request so the store can be created by the lifespan
+        self.store = store or get_session_store
+        self.flags = f"Path={path}; HttpOnly; SameSite={same_site}" + ("; Secure" if secure else "")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        sid = None
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                sid = decode_session_id(cookie_parser(value.decode("latin-1")).get(self.cookie_name))
+                break
+        session = scope["session"] = Session(self.store(), sid)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                cookie = await session.commit()
+                if cookie is not None:
+                    headers = MutableHeaders(scope=message)
+                    if cookie:
+                        headers.append("Set-Cookie", f"{self.cookie_name}={cookie}; {self.flags}")
+                    else:
+                        headers.append("Set-Cookie", f"{self.cookie_name}=; Max-Age=0; {self.flags}")
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,10 @@
+from .base import Rate, RateLimitBackend, parse_rate
+from .dependencies import (
+    RateLimit,
+    RateLimitExceeded,
+    bearer_token,
+    body_email,
+    client_ip,
+    form_username,
+)
+from .manager import close_rate_limiter, get_rate_limiter
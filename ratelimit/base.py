@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+_UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True, slots=True)
+class Rate:
+    """Allow count hits per period seconds"""
+    count: int
+    period: float
+
+    @property
+    def interval(self) -> float:
+        """Seconds one hit occupies; the bucket refills one hit per interval"""
+        return self.period / self.count
+
+
+def parse_rate(spec: str) -> Rate:
+    """Parse "5/minute" or "100/hour" into a Rate"""
+    count, sep, unit = spec.strip().partition("/")
+    unit = unit.strip().rstrip("s") or "second"
+    if not sep or unit not in _UNITS or int(count) <= 0:
+        raise ValueError(f"Invalid rate: {spec!r}")
+    return Rate(count=int(count), period=_UNITS[unit])
+
+
+class RateLimitBackend:
+    """Interface every rate limit backend implements"""
+
+    async def hit(self, key: str, rate: Rate) -> Tuple[bool, float]:
+        """Record one hit for key
+
+        Returns whether it is allowed and, if not, the seconds until the
+        next hit would be.
+        """
+        raise NotImplementedError
+
+    async def reset(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release backend resources"""
@@ -0,0 +1,38 @@
+from typing import Optional
+from cache.redis import RedisClient
+from config.config import settings
+from .base import RateLimitBackend
+from .memory import MemoryBackend
+from .redis import RedisBackend
+
+
+def create_backend(name: str, prefix: str = "") -> RateLimitBackend:
+    """Build a rate limit backend from its RATE_LIMIT_DRIVER name"""
+    if name == "memory":
+        return MemoryBackend(maxsize=settings.RATE_LIMIT_MAX_KEYS)
+    if name == "redis":
+        client = RedisClient(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD,
+        )
+        return RedisBackend(client, prefix=prefix)
+    raise ValueError(f"Unsupported rate limit driver: {name}")
+
+
+_backend: Optional[RateLimitBackend] = None
+
+
+def get_rate_limiter() -> RateLimitBackend:
+    """Get the process-wide backend configured by RATE_LIMIT_DRIVER"""
+    global _backend
+    if _backend is None:
+        _backend = create_backend(settings.RATE_LIMIT_DRIVER, prefix=f"{settings.CACHE_PREFIX}:ratelimit:")
+    return _backend
+
+
+async def close_rate_limiter() -> None:
+    global _backend
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
@@ -0,0 +1,49 @@
+import time
+from typing import Dict, List, Tuple
+from .base import Rate, RateLimitBackend
+
+
+class MemoryBackend(RateLimitBackend):
+    """Per-process GCRA limiter over a sharded dict
+
+    GCRA (a token bucket expressed as one timestamp) keeps a single float
+    per key: the theoretical arrival time of the next hit. A key whose
+    timestamp is in the past is fully refilled and indistinguishable from
+    a missing one, so it can be dropped at any time. Sharding bounds the
+    cost of that sweep to one shard when it fills up.
+    """
+
+    def __init__(self, shards: int = 16, maxsize: int = 100000):
+        self._shards: List[Dict[str, float]] = [{} for _ in range(shards)]
+        self._shard_size = max(1, maxsize // shards)
+        self.evictions = 0
+
+    def _shard(self, key: str) -> Dict[str, float]:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _sweep(self, shard: Dict[str, float], now: float) -> None:
+        for key in [k for k, tat in shard.items() if tat <= now]:
+            del shard[key]
+        # Still full of live keys: drop the oldest ones to stay bounded
+        while len(shard) >= self._shard_size:
+            del shard[next(iter(shard))]
+            self.evictions += 1
+
+    async def hit(self, key: str, rate: Rate) -> Tuple[bool, float]:
+        now = time.monotonic()
+        shard = self._shard(key)
+        tat = max(shard.get(key, now), now)
+        new_tat = tat + rate.interval
+        allow_at = new_tat - rate.period
+        if allow_at > now:
+            return False, allow_at - now
+        if key not in shard and len(shard) >= self._shard_size:
+            self._sweep(shard, now)
+        shard[key] = new_tat
+        return True, 0.0
+
+    async def reset(self, key: str) -> None:
+        self._shard(key).pop(key, None)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
@@ -0,0 +1,60 @@
+import math
+import time
+from typing import Tuple
+from cache.redis import RedisClient
+from .base import Rate, RateLimitBackend
+
+
+class RedisBackend(RateLimitBackend):
+    """Sliding-window counter shared by every worker through Redis
+
+    Uses only INCR, GET, PEXPIRE and DEL so it works against any
+    Redis-protocol server, including ones without scripting. Each key
+    holds two integer counters (current and previous window); the
+    previous window is weighted by how much of it still overlaps the
+    sliding window. Rejected hits are counted too, so a client that
+    keeps hammering stays limited.
+    """
+
+    def __init__(self, client: RedisClient, prefix: str = ""):
+        self.client = client
+        self.prefix = prefix
+
+    async def hit(self, key: str, rate: Rate) -> Tuple[bool, float]:
+        now = time.time()
+        window = int(now // rate.period)
+        elapsed = now / rate.period - window
+        current_key = f"{self.prefix}{key}:{window}"
+
+        current = await self.client.execute("INCR", current_key)
+        if current == 1:
+            await self.client.execute("PEXPIRE", current_key, math.ceil(rate.period * 2000))
+        previous = int(await self.client.execute("GET", f"{self.prefix}{key}:{window - 1}") or 0)
+
+        weight = 1 - elapsed
+        if previous * weight + current <= rate.count:
+            return True, 0.0
+        # Wait until the previous window has decayed enough, or the next window
+        if previous and current <= rate.count:
+            decay_until = 1 - (rate.count - current) / previous
+            retry_after = (decay_until - elapsed) * rate.period
+        else:
+            # This window becomes the previous one and still has to decay
+            carry = max(0.0, 1 - (rate.count - 1) / current)
+            retry_after = (1 - elapsed + carry) * rate.period
+        return False, max(retry_after, 0.0)
+
+    async def reset(self, key: str) -> None:
+        # Window length is not known here, so drop every counter of the key
+        cursor = b"0"
+        while True:
+            cursor, keys = await self.client.execute(
+                "SCAN", cursor, "MATCH", f"{self.prefix}{key}:*", "COUNT", 100
+            )
+            if keys:
+                await self.client.execute("DEL", *keys)
+            if cursor == b"0":
+                break
+
+    async def close(self) -> None:
+        await self.client.close()
@@ -2,6 +2,7 @@ from fastapi import APIRouter
 from app.auth.api import router as auth_router
 from app.user.api import router as user_router
 from app.article.api import router as article_router
+from app.internal.api import router as internal_router
 
 # Create API router
 api_router = APIRouter()
@@ -10,6 +11,7 @@ api_router = APIRouter()
 api_router.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(user_router, prefix="/users", tags=["Users"])
 api_router.include_router(article_router, prefix="/articles", tags=["Articles"])
+api_router.include_router(internal_router, prefix="/internal", tags=["Internal"])
 
 # Health check route
 @api_router.get("/health", tags=["Health"])
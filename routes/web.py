@@ -1,4 +1,9 @@
-from fastapi import APIRouter
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Header
+from fastapi.responses import PlainTextResponse
+from config.config import settings
+from metrics import CONTENT_TYPE, collect, render
 
 # Create web router
 web_router = APIRouter()
@@ -10,3 +15,13 @@ async def home():
         "docs": "/docs",
         "health": "/health"
     }
+
+
+@web_router.get("/metrics", include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)):
+    # Same internals as /v1/internal/stats; require METRICS_TOKEN when set
+    if settings.METRICS_TOKEN and not secrets.compare_digest(
+        (authorization or "").encode(), f"Bearer {settings.METRICS_TOKEN}".encode()
+    ):
+        return PlainTextResponse("Unauthorized", status_code=401, headers={"WWW-Authenticate": "Bearer"})
+    return PlainTextResponse(render(await collect()), media_type=CONTENT_TYPE)
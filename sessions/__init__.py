@@ -0,0 +1,7 @@
+from .base import SessionStore
+from .dependencies import get_session
+from .file import FileStore
+from .manager import close_session_store, get_session_store
+from .memory import MemoryStore
+from .redis import RedisStore
+from .session import Session
@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+from metrics.collectors import SESSIONS_EXPIRED
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore:
+    """Interface every session store implements
+
+    Session ids are the raw 16 random bytes behind the cookie; data is
+    the serialized session. Expiry is sliding: load() and save() keep a
+    session alive for another lifetime seconds. Stores never check
+    expiry on the request path. sweep() drops idle sessions in bulk
+    from a background task every sweep_interval seconds, so a session
+    expires between lifetime and lifetime + sweep_interval after its
+    last use.
+    """
+
+    def __init__(self, lifetime: float, sweep_interval: float):
+        self.lifetime = lifetime
+        self.sweep_interval = sweep_interval
+        self.expired = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def load(self, sid: bytes) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def save(self, sid: bytes, data: bytes) -> None:
+        raise NotImplementedError
+
+    async def delete(self, sid: bytes) -> None:
+        raise NotImplementedError
+
+    async def sweep(self) -> int:
+        """Drop idle sessions; returns how many expired"""
+        return 0
+
+    async def _sweep_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                expired = await self.sweep()
+            except Exception as e:
+                logger.error(f"Session sweep failed: {e}")
+                continue
+            self.expired += expired
+            SESSIONS_EXPIRED.inc(expired)
+
+    def start(self) -> None:
+        if self._task is None and self.sweep_interval > 0:
+            self._task = asyncio.create_task(self._sweep_periodically())
+
+    async def close(self) -> None:
+        """Stop the sweeper and release store resources"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"store": type(self).__name__, "expired": self.expired}
@@ -0,0 +1,13 @@
+from fastapi import Request
+from .session import Session
+
+
+async def get_session(request: Request) -> Session:
+    """The request's session, loaded from the store
+
+    Only routes that depend on this pay for the store read.
+    """
+    session = request.scope.get("session")
+    if not isinstance(session, Session):
+        raise RuntimeError("SessionMiddleware is not installed")
+    return await session.load()
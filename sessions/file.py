@@ -0,0 +1,79 @@
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from .base import SessionStore
+
+
+class FileStore(SessionStore):
+    """Sessions stored as one file per id, shared by all workers on a host
+
+    A file's mtime is its last use. Loads refresh it at most once per
+    sweep interval, and the sweep unlinks files idle for longer than
+    the lifetime in one directory pass.
+    """
+
+    def __init__(self, path: str, lifetime: float, sweep_interval: Optional[float] = None):
+        super().__init__(lifetime, sweep_interval if sweep_interval is not None else lifetime / 4)
+        self.path = Path(path)
+
+    def _file(self, sid: bytes) -> Path:
+        name = sid.hex()
+        return self.path / name[:2] / name
+
+    def _read(self, sid: bytes) -> Optional[bytes]:
+        file = self._file(sid)
+        try:
+            with open(file, "rb") as f:
+                data = f.read()
+                mtime = os.fstat(f.fileno()).st_mtime
+        except FileNotFoundError:
+            return None
+        now = time.time()
+        if now - mtime >= self.sweep_interval:
+            try:
+                os.utime(file, (now, now))
+            except FileNotFoundError:
+                return None
+        return data
+
+    def _write(self, sid: bytes, data: bytes) -> None:
+        file = self._file(sid)
+        file.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so readers never see a partial file
+        tmp = file.with_name(f"{file.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, file)
+
+    def _sweep(self) -> int:
+        if not self.path.exists():
+            return 0
+        cutoff = time.time() - self.lifetime
+        expired = 0
+        for directory in os.scandir(self.path):
+            if not directory.is_dir():
+                continue
+            for entry in os.scandir(directory.path):
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        expired += 1
+                except FileNotFoundError:
+                    pass
+        return expired
+
+    async def load(self, sid: bytes) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, sid)
+
+    async def save(self, sid: bytes, data: bytes) -> None:
+        await asyncio.to_thread(self._write, sid, data)
+
+    async def delete(self, sid: bytes) -> None:
+        await asyncio.to_thread(self._file(sid).unlink, True)
+
+    async def sweep(self) -> int:
+        return await asyncio.to_thread(self._sweep)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "path": str(self.path)}
@@ -0,0 +1,46 @@
+from typing import Optional
+from cache.redis import RedisClient
+from config.config import settings
+from .base import SessionStore
+from .file import FileStore
+from .memory import MemoryStore
+from .redis import RedisStore
+
+
+def create_store(name: str, lifetime: float, prefix: str = "") -> SessionStore:
+    """Build a session store from its SESSION_DRIVER name"""
+    if name == "memory":
+        return MemoryStore(lifetime)
+    if name == "file":
+        return FileStore(settings.SESSION_PATH, lifetime)
+    if name == "redis":
+        client = RedisClient(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD,
+        )
+        return RedisStore(client, lifetime, prefix=prefix)
+    raise ValueError(f"Unsupported session driver: {name}")
+
+
+_store: Optional[SessionStore] = None
+
+
+def get_session_store() -> SessionStore:
+    """Get the process-wide store configured by SESSION_DRIVER"""
+    global _store
+    if _store is None:
+        _store = create_store(
+            settings.SESSION_DRIVER,
+            # SESSION_LIFETIME is in minutes
+            settings.SESSION_LIFETIME * 60,
+            prefix=f"{settings.CACHE_PREFIX}:session:",
+        )
+    return _store
+
+
+async def close_session_store() -> None:
+    global _store
+    if _store is not None:
+        await _store.close()
+        _store = None
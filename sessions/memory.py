@@ -0,0 +1,64 @@
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+from .base import SessionStore
+
+
+class MemoryStore(SessionStore):
+    """Per-process sessions in generational dicts
+
+    Instead of an expiry timestamp per session, sessions live in one of
+    generations + 1 dicts of raw id -> serialized data, each holding the
+    sessions last used during one sweep interval (lifetime /
+    generations). A load from an older generation moves the session to
+    the current one. Sweeping starts a new generation and drops the
+    oldest one whole, so expiry needs no per-request check and no
+    per-session timestamp. A session takes about 125 bytes plus its serialized
+    data (a 16-byte key, a bytes value and one dict slot): 1M sessions
+    with a typical 60-byte payload hold about 180 MB
+    (benchmarks/sessions_memory.py).
+    """
+
+    def __init__(self, lifetime: float, generations: int = 4):
+        super().__init__(lifetime, lifetime / generations)
+        self._generations: Deque[Dict[bytes, bytes]] = deque([{}], maxlen=generations + 1)
+
+    def __len__(self) -> int:
+        return sum(len(generation) for generation in self._generations)
+
+    async def load(self, sid: bytes) -> Optional[bytes]:
+        current = self._generations[-1]
+        data = current.get(sid)
+        if data is not None:
+            return data
+        for generation in self._generations:
+            data = generation.pop(sid, None)
+            if data is not None:
+                current[sid] = data
+                return data
+        return None
+
+    async def save(self, sid: bytes, data: bytes) -> None:
+        current = self._generations[-1]
+        if sid not in current:
+            for generation in self._generations:
+                generation.pop(sid, None)
+        current[sid] = data
+
+    async def delete(self, sid: bytes) -> None:
+        for generation in self._generations:
+            generation.pop(sid, None)
+
+    async def sweep(self) -> int:
+        expired = 0
+        if len(self._generations) == self._generations.maxlen:
+            expired = len(self._generations[0])
+        # The deque's maxlen pushes out the oldest generation
+        self._generations.append({})
+        return expired
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "sessions": len(self),
+            "generations": [len(generation) for generation in self._generations],
+        }
@@ -0,0 +1,34 @@
+from typing import Optional
+from cache.redis import RedisClient
+from .base import SessionStore
+
+
+class RedisStore(SessionStore):
+    """Sessions stored in a Redis-protocol server with a per-key TTL
+
+    GETEX (Redis 6.2+) reads a session and extends its TTL in one round
+    trip. The server expires idle keys itself, so there is nothing to
+    sweep.
+    """
+
+    def __init__(self, client: RedisClient, lifetime: float, prefix: str = ""):
+        super().__init__(lifetime, 0)
+        self.client = client
+        self.prefix = prefix
+        self.ttl = max(1, int(lifetime))
+
+    def key(self, sid: bytes) -> str:
+        return f"{self.prefix}{sid.hex()}"
+
+    async def load(self, sid: bytes) -> Optional[bytes]:
+        return await self.client.execute("GETEX", self.key(sid), "EX", self.ttl)
+
+    async def save(self, sid: bytes, data: bytes) -> None:
+        await self.client.execute("SET", self.key(sid), data, "EX", self.ttl)
+
+    async def delete(self, sid: bytes) -> None:
+        await self.client.execute("DEL", self.key(sid))
+
+    async def close(self) -> None:
+        await super().close()
+        await self.client.close()
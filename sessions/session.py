@@ -0,0 +1,138 @@
+import base64
+import binascii
+import json
+import secrets
+from typing import Any, Dict, Iterator, MutableMapping, Optional
+from .base import SessionStore
+
+SESSION_ID_BYTES = 16
+
+_NOT_LOADED = "Session accessed before it was loaded; depend on get_session"
+
+
+def new_session_id() -> bytes:
+    return secrets.token_bytes(SESSION_ID_BYTES)
+
+
+def encode_session_id(sid: bytes) -> str:
+    return base64.urlsafe_b64encode(sid).rstrip(b"=").decode()
+
+
+def decode_session_id(value: Optional[str]) -> Optional[bytes]:
+    """Raw id behind a cookie value, or None when it cannot be one"""
+    if not value or len(value) != 22:
+        return None
+    try:
+        return base64.urlsafe_b64decode(value + "==")
+    except (binascii.Error, ValueError):
+        return None
+
+
+def dumps(data: Dict[str, Any]) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def loads(data: bytes) -> Dict[str, Any]:
+    return json.loads(data)
+
+
+class Session(MutableMapping):
+    """A request's session, loaded from the store on first use
+
+    Nothing is read until load() (the get_session dependency calls it),
+    and commit() writes back only when the data changed. Assignments
+    mark the session modified; mutate nested values in place and set
+    modified yourself.
+    """
+
+    def __init__(self, store: SessionStore, sid: Optional[bytes]):
+        self.store = store
+        self.id = sid
+        self.modified = False
+        self._data: Optional[Dict[str, Any]] = None
+        # Id that was loaded, and must be deleted if the id changes
+        self._stored_id: Optional[bytes] = None
+        self._invalidated = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    async def load(self) -> "Session":
+        if self._data is not None:
+            return self
+        raw = await self.store.load(self.id) if self.id is not None else None
+        if raw is None:
+            # Never adopt an id the client made up: a new session gets a new id
+            self.id = None
+            self._data = {}
+        else:
+            self._stored_id = self.id
+            self._data = loads(raw)
+        return self
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            raise RuntimeError(_NOT_LOADED)
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.data[key] = value
+        self.modified = True
+
+    def __delitem__(self, key: str) -> None:
+        del self.data[key]
+        self.modified = True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def regenerate(self) -> None:
+        """Keep the data under a new id, e.g. after login to prevent fixation"""
+        if self._data is None:
+            raise RuntimeError(_NOT_LOADED)
+        self.id = None
+        self.modified = True
+
+    def invalidate(self) -> None:
+        """Delete the session and its cookie, e.g. on logout"""
+        self.data.clear()
+        self.id = None
+        self._invalidated = True
+        self.modified = False
+
+    async def commit(self) -> Optional[str]:
+        """Write back a modified session
+
+        Returns the cookie value to set when the id changed, "" when the
+        cookie should be cleared and None when it stays as it is.
+        """
+        if self._data is None:
+            return None
+        if self._invalidated and not self.modified:
+            if self._stored_id is not None:
+                await self.store.delete(self._stored_id)
+                self._stored_id = None
+            return ""
+        if not self.modified:
+            return None
+        if not self._data and self._stored_id is None:
+            # Emptied before it was ever stored: nothing to keep
+            return None
+        if self.id is None:
+            self.id = new_session_id()
+        await self.store.save(self.id, dumps(self._data))
+        self.modified = False
+        previous, self._stored_id = self._stored_id, self.id
+        if previous == self.id:
+            return None
+        if previous is not None:
+            await self.store.delete(previous)
+        return encode_session_id(self.id)